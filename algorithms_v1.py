@@ -37,16 +37,20 @@ def dfs_from_src(s, graph):
     visited = [False] * n
     order = []
     
-    # define a nested function
-    def dfs(u):
-        visited[u] = True
-        order.append(u)
-        for v in range(n):
+    # explicit stack instead of recursion, so long chains don't hit the recursion limit
+    # stack[-1] = (node, next column of its row to check), same visiting order as the recursive version
+    visited[s] = True
+    order.append(s)
+    stack = [(s, 0)]
+    while stack:
+        u, start = stack.pop()
+        for v in range(start, n):
             if graph[u][v] < INF and not visited[v]:
-                dfs(v)      # explores v and all its children before returning
-
-    # explore dfs from source
-    dfs(s)
+                stack.append((u, v + 1))    # come back to u's remaining neighbors later
+                visited[v] = True
+                order.append(v)
+                stack.append((v, 0))        # explores v and all its children first
+                break
 
     # visited = array of booleans indicating which nodes were reachable
     # order = sequence of nodes visited in DFS order
@@ -36,16 +36,26 @@ def dfs_from_src_list(s, adj):
     n = len(adj)
     visited = [False] * n 
     order = []
-    def dfs(u):
-        visited[u] = True
-        order.append(u)
-        for v, w in adj[u]:                 # again only check actual neighbors
+    # explicit stack of neighbor iterators instead of recursion (no recursion limit on long chains)
+    # visits nodes in the same order as the recursive version
+    visited[s] = True
+    order.append(s)
+    stack = [iter(adj[s])]
+    while stack:
+        for v, w in stack[-1]:              # again only check actual neighbors
             if not visited[v]:
-                dfs(v)
-    dfs(s)
+                visited[v] = True
+                order.append(v)
+                stack.append(iter(adj[v]))
+                break
+        else:
+            stack.pop()
     return visited, order
 
-def dijkstra_from_src_list(s, adj):
+# stats = optional search_stats.SearchStats, counts the work of this call
+def dijkstra_from_src_list(s, adj, stats=None):
+    if stats is not None:
+        return _dijkstra_from_src_list_counted(s, adj, stats)
     n = len(adj)
     dist = [INF] * n 
     prev = [-1] * n 
@@ -65,17 +75,52 @@ def dijkstra_from_src_list(s, adj):
                 heapq.heappush(pq, (dist[v], v))
     return dist, prev
 
+# dijkstra_from_src_list with SearchStats counters (same results)
+def _dijkstra_from_src_list_counted(s, adj, stats):
+    n = len(adj)
+    dist = [INF] * n
+    prev = [-1] * n
+    dist[s] = 0
+    pq = [(0, s)]
+    pushes = 1
+    pops = stale = relax = settled = 0
+    peak = 1
+    while pq:
+        d, u = heapq.heappop(pq)
+        pops += 1
+        if d > dist[u]:
+            stale += 1
+            continue
+        settled += 1
+        for v, w in adj[u]:
+            relax += 1
+            new_d = dist[u] + w
+            if new_d < dist[v]:
+                dist[v] = new_d
+                prev[v] = u
+                heapq.heappush(pq, (dist[v], v))
+                pushes += 1
+                if len(pq) > peak:
+                    peak = len(pq)
+    stats.record(pushes, pops, stale, relax, settled, peak)
+    return dist, prev
+
 # src = source airport index
 # des = destination airport index
 # adj = adjacency list
 # coords_idx = list of (x, y) coordinates indexed by airport index
-def astar(src, des, adj, coords_idx):
+# heuristic_fn = lower bound on the remaining distance, called as heuristic_fn(v, des, coords_idx)
+#                (another estimate, e.g. landmarks.alt_heuristic, can pass its own table as coords_idx)
+# stats = optional search_stats.SearchStats, counts the work of this call
+def astar(src, des, adj, coords_idx, heuristic_fn=heuristic, stats=None):
+    if stats is not None:
+        return _astar_counted(src, des, adj, coords_idx, heuristic_fn, stats)
     n = len(adj)
     g = [INF] * n               # g = actual cost from source to each node
     prev = [-1] * n 
     g[src] = 0.0                # zero cost to reach source
     pq = []
-    h0 = heuristic(src, des, coords_idx)        # estimated cost from source to destination
+    h0 = heuristic_fn(src, des, coords_idx)     # estimated cost from source to destination
     heapq.heappush(pq, (h0, 0.0, src))
 
     # difference from Dijkstra
@@ -94,7 +139,7 @@ def astar(src, des, adj, coords_idx):
             if new_g <g[v]:
                 g[v] = new_g
                 prev[v] = u 
-                hv = heuristic(v, des, coords_idx)
+                hv = heuristic_fn(v, des, coords_idx)
                 f_v = new_g + hv
                 #use the sum of Euclidean length from current node to destination and flight distance from scource to current as the sorting key in priority queue
                 heapq.heappush(pq, (f_v, new_g, v))
@@ -103,6 +148,66 @@ def astar(src, des, adj, coords_idx):
     # prev = predecessor
     return g, prev
 
+# astar with SearchStats counters (same results)
+def _astar_counted(src, des, adj, coords_idx, heuristic_fn, stats):
+    n = len(adj)
+    g = [INF] * n
+    prev = [-1] * n
+    g[src] = 0.0
+    pq = [(heuristic_fn(src, des, coords_idx), 0.0, src)]
+    pushes = 1
+    pops = stale = relax = settled = 0
+    peak = 1
+    while pq:
+        f, cur_g, u = heapq.heappop(pq)
+        pops += 1
+        if u == des:
+            settled += 1
+            break
+        if cur_g > g[u]:
+            stale += 1
+            continue
+        settled += 1
+
+        for v, w in adj[u]:
+            relax += 1
+            new_g = g[u] + w
+            if new_g < g[v]:
+                g[v] = new_g
+                prev[v] = u
+                heapq.heappush(pq, (new_g + heuristic_fn(v, des, coords_idx), new_g, v))
+                pushes += 1
+                if len(pq) > peak:
+                    peak = len(pq)
+    stats.record(pushes, pops, stale, relax, settled, peak)
+    return g, prev
+
+# A* with precomputed potentials
+# pot[v] = lower bound on the distance from v to des (e.g. great_circle.GreatCircleHeuristic)
+# same search as astar, but the hot loop only does a list/array lookup per push
+def astar_potential(src, des, adj, pot):
+    n = len(adj)
+    g = [INF] * n
+    prev = [-1] * n
+    g[src] = 0.0
+    pq = [(pot[src], 0.0, src)]
+
+    while pq:
+        f, cur_g, u = heapq.heappop(pq)
+        if u == des:
+            break
+        if cur_g > g[u]:
+            continue
+
+        for v, w in adj[u]:
+            new_g = cur_g + w
+            if new_g < g[v]:
+                g[v] = new_g
+                prev[v] = u
+                heapq.heappush(pq, (new_g + pot[v], new_g, v))
+
+    return g, prev
+
 # build path from prev array
 def reconstruct_path(start, target, prev):
     path = []
@@ -117,6 +222,146 @@ def reconstruct_path(start, target, prev):
         return None
     return path
 
+# point-to-point Dijkstra
+# same search as dijkstra_from_src_list, but stops as soon as dst is settled
+# dist/prev are dicts so only the touched part of the graph is allocated
+# returns (distance, path) or (INF, None) if dst is unreachable
+def dijkstra_point_to_point(src, dst, adj):
+    dist = {src: 0}
+    prev = {src: -1}
+    pq = [(0, src)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        # dst popped = settled, its distance can no longer improve
+        if u == dst:
+            return d, reconstruct_path(src, dst, prev)
+        for v, w in adj[u]:
+            new_d = d + w
+            if new_d < dist.get(v, INF):
+                dist[v] = new_d
+                prev[v] = u
+                heapq.heappush(pq, (new_d, v))
+    return INF, None
+
+# bidirectional Dijkstra
+# one search forward from src over adj, one backward from dst over radj (reverse adjacency)
+# always advance the side whose heap top is smaller
+# mu = best src -> dst distance seen where the two searches touched
+# stop once top_forward + top_backward >= mu, no shorter meeting point can exist
+def bidirectional_dijkstra(src, dst, adj, radj):
+    if src == dst:
+        return 0, [src]
+
+    dist_f = {src: 0}
+    dist_b = {dst: 0}
+    prev_f = {src: -1}
+    next_b = {dst: -1}          # successor towards dst in the backward tree
+    pq_f = [(0, src)]
+    pq_b = [(0, dst)]
+    mu = INF
+    meet = -1
+
+    while pq_f and pq_b:
+        if pq_f[0][0] + pq_b[0][0] >= mu:
+            break
+
+        if pq_f[0][0] <= pq_b[0][0]:
+            d, u = heapq.heappop(pq_f)
+            if d > dist_f[u]:
+                continue
+            for v, w in adj[u]:
+                new_d = d + w
+                if new_d < dist_f.get(v, INF):
+                    dist_f[v] = new_d
+                    prev_f[v] = u
+                    heapq.heappush(pq_f, (new_d, v))
+                if v in dist_b and dist_f[v] + dist_b[v] < mu:
+                    mu = dist_f[v] + dist_b[v]
+                    meet = v
+        else:
+            d, u = heapq.heappop(pq_b)
+            if d > dist_b[u]:
+                continue
+            for v, w in radj[u]:
+                new_d = d + w
+                if new_d < dist_b.get(v, INF):
+                    dist_b[v] = new_d
+                    next_b[v] = u
+                    heapq.heappush(pq_b, (new_d, v))
+                if v in dist_f and dist_b[v] + dist_f[v] < mu:
+                    mu = dist_b[v] + dist_f[v]
+                    meet = v
+
+    if meet == -1:
+        return INF, None
+
+    # glue src -> meet (forward tree) and meet -> dst (backward tree)
+    path = reconstruct_path(src, meet, prev_f)
+    cur = next_b[meet]
+    while cur != -1:
+        path.append(cur)
+        cur = next_b[cur]
+    return mu, path
+
+# Dijkstra from s that stops once every node in targets is settled
+# returns dist/prev lists like dijkstra_from_src_list; entries of nodes that were
+# not settled when the search stopped are upper bounds only, targets are exact
+# (no targets = no search, only dist[s] = 0 is set)
+def dijkstra_multi_target(s, adj, targets):
+    n = len(adj)
+    dist = [INF] * n
+    prev = [-1] * n
+    dist[s] = 0
+    remaining = set(targets)
+    if not remaining:
+        return dist, prev
+    pq = [(0, s)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        if u in remaining:
+            remaining.discard(u)
+            if not remaining:
+                break
+        for v, w in adj[u]:
+            new_d = d + w
+            if new_d < dist[v]:
+                dist[v] = new_d
+                prev[v] = u
+                heapq.heappush(pq, (new_d, v))
+    return dist, prev
+
+# origin x destination distance table, returned as a dense float64 NumPy array
+# out[i][j] = shortest distance sources[i] -> targets[j] (inf if unreachable)
+# mode = "targets": one Dijkstra per source, stopped once all targets are settled
+#        "buckets": bucket-based search on a contraction hierarchy (pass ch=build_ch(adj));
+#                   backward searches from the targets are done once and shared by all sources
+#                   measured 50 x 200 tables on random networks (benchmark.run_many_to_many_benchmark):
+#                   n=1000 26 ms vs 30 ms for "targets", n=10000 337 ms vs 403 ms, plus 0.13 s /
+#                   1.5 s to build the hierarchy; random networks contract poorly (see build_ch),
+#                   so it only pays off when the hierarchy is reused for many tables
+# NumPy and contraction_hierarchy are only imported here, the searches above do not need them
+def many_to_many(sources, targets, adj, mode="targets", ch=None):
+    import numpy as np
+
+    out = np.full((len(sources), len(targets)), INF)
+    if mode == "buckets":
+        if ch is None:
+            raise ValueError("bucket mode needs a contraction hierarchy (ch=build_ch(adj))")
+        from contraction_hierarchy import ch_many_to_many
+
+        return ch_many_to_many(ch, sources, targets, out)
+    if mode != "targets":
+        raise ValueError(f"unknown many-to-many mode: {mode}")
+
+    for i, s in enumerate(sources):
+        dist, _ = dijkstra_multi_target(s, adj, targets)
+        out[i] = [dist[t] for t in targets]
+    return out
+
 # helper functions to run all pairs for testing
 # runs BFS, DFS, Dijkstra, A* n times (once from each node)
 def bfs_all_sources(adj):
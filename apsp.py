@@ -0,0 +1,110 @@
+from time import perf_counter
+
+import numpy as np
+
+from algorithms_v1 import reconstruct_Dijkstra
+
+INF = float("inf")
+
+# all-pairs shortest paths on the dense matrix (Floyd-Warshall, NumPy)
+# instead of running dijkstra_from_src n times (O(V^3 log V) in pure Python),
+# every step k does one vectorized "min-plus" update of the whole matrix:
+#   D[i][j] = min(D[i][j], D[i][k] + D[k][j])
+# the update is done in tiles of rows so the temporaries stay in cache
+#
+# besides distances two index matrices are kept:
+#   pred[i][j] = node before j on the shortest path i -> j
+#                (pred[s] is a valid shortest-path predecessor array for reconstruct_Dijkstra;
+#                with tied weights it can be a different, equally short tree than
+#                dijkstra_from_src(s, graph) builds)
+#   nxt[i][j]  = first node after i on the shortest path i -> j (next hop)
+# both are -1 where j is unreachable from i
+
+
+# graph = adjacency matrix from graph_matrix.build_matrix (list of lists) or a NumPy array
+# block = rows per tile
+def floyd_warshall_np(graph, block=128):
+    D = np.array(graph, dtype=np.float64)
+    n = D.shape[0]
+
+    idx = np.arange(n)
+    edge = np.isfinite(D)
+    edge[idx, idx] = False
+    pred = np.where(edge, idx[:, None], -1).astype(np.int32)
+    nxt = np.where(edge, idx[None, :], -1).astype(np.int32)
+    nxt[idx, idx] = idx
+
+    # scratch buffers reused for every tile
+    cand = np.empty((block, n), dtype=np.float64)
+    mask = np.empty((block, n), dtype=bool)
+
+    for k in range(n):
+        row_k = D[k]
+        pred_k = pred[k]
+        col_k = D[:, k]
+        for r0 in range(0, n, block):
+            r1 = min(r0 + block, n)
+            # rows that cannot reach k can never improve through k
+            if not np.isfinite(col_k[r0:r1]).any():
+                continue
+            b = r1 - r0
+            c = cand[:b]
+            m = mask[:b]
+            tile = D[r0:r1]             # views, updated in place
+            np.add(tile[:, k, None], row_k, out=c)
+            np.less(c, tile, out=m)
+            if not m.any():
+                continue
+            np.copyto(tile, c, where=m)
+            np.copyto(pred[r0:r1], pred_k, where=m)
+            h = nxt[r0:r1]
+            np.copyto(h, h[:, k, None], where=m)
+
+    return D, pred, nxt
+
+
+# prev array of source s, usable with algorithms_v1.reconstruct_Dijkstra
+def prev_from_apsp(pred, s):
+    return pred[s].tolist()
+
+
+# walk next hops from start to target
+# returns a shortest path start -> target, as short as
+# reconstruct_Dijkstra(start, target, prev_from_apsp(pred, start)) but with tied
+# weights not necessarily the same one
+def reconstruct_next_hop(start, target, nxt):
+    if nxt[start][target] == -1:
+        return None
+    path = [start]
+    cur = start
+    while cur != target:
+        cur = int(nxt[cur][target])
+        path.append(cur)
+    return path
+
+
+if __name__ == "__main__":
+    from benchmark import generate_random_airports_and_routes, dijkstra_all_sources_matrix
+    from graph_matrix import build_matrix
+    from algorithms_v1 import dijkstra_from_src
+
+    for n in (200, 500, 1000):
+        airports, routes = generate_random_airports_and_routes(n, edge_prob=0.02, seed=1)
+        graph = build_matrix(airports, routes)
+
+        t0 = perf_counter()
+        D, pred, nxt = floyd_warshall_np(graph)
+        t1 = perf_counter()
+        line = f"n={n}: Floyd-Warshall (NumPy) {t1 - t0:.2f} s"
+        if n <= 500:
+            dijkstra_all_sources_matrix(graph)
+            line += f", Dijkstra from every source {perf_counter() - t1:.2f} s"
+        print(line)
+
+        # spot-check one source against the matrix Dijkstra
+        dist, prev = dijkstra_from_src(0, graph)
+        assert np.array_equal(D[0], np.array(dist, dtype=np.float64))
+        for t in range(n):
+            path = reconstruct_Dijkstra(0, t, prev_from_apsp(pred, 0))
+            if path is not None:
+                assert path[-1] == t and reconstruct_next_hop(0, t, nxt)[-1] == t
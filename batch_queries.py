@@ -0,0 +1,214 @@
+import argparse
+import csv
+import heapq
+import os
+import random
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from algorithms_v2 import dijkstra_multi_target
+from route_service import add_graph_arguments, graph_spec, load_graph
+
+# offline batch distances: millions of (src, dst) pairs, one search per origin
+#
+#   python batch_queries.py pairs.csv distances.csv --graph snapshot --snapshot net.snap --workers 8
+#
+# input:  CSV rows "src,dst" (airport codes), an optional "src,dst" header is skipped
+# output: CSV "row_id,src,dst,distance", row_id = 0-based data row of the input
+#         distance = "inf" if dst is unreachable, empty for an unknown airport
+#         malformed rows (fewer than two fields, empty code) are skipped, they keep
+#         their row_id so later rows still line up; both are counted in the summary
+#
+# 1) the input is streamed once and every row is appended to one of --shards
+#    spill files, chosen by a hash of the origin, so all pairs of an origin end up
+#    in the same shard and memory never holds more than the open files
+# 2) shards are processed in worker processes (graph loaded once per worker):
+#    a shard's pairs are grouped by origin and each origin gets one
+#    dijkstra_multi_target call that stops once all its destinations are settled
+# 3) shard results are appended to the output as soon as a shard is done (any
+#    row order, keyed by row_id), or with --ordered merged back into input order
+#    (each shard is written sorted, then a streaming k-way merge)
+
+
+# ---------------- worker side ---------------- #
+
+_graph = None
+
+
+def _init_worker(spec):
+    global _graph
+    _graph = load_graph(spec)
+
+
+# answer one spill file, rows of the result sorted by row_id
+# returns (rows, origins, rows with an unknown airport, seconds)
+def _process_shard(in_path, out_path):
+    t0 = perf_counter()
+    adj = _graph["adj"]
+    name_to_idx = _graph["name_to_idx"]
+
+    by_origin = {}      # src code -> [(row_id, dst code), ...]
+    with open(in_path, newline="") as f:
+        for row_id, src, dst in csv.reader(f):
+            by_origin.setdefault(src, []).append((int(row_id), dst))
+
+    results = []
+    unknown = 0
+    for src, pairs in by_origin.items():
+        s = name_to_idx.get(src)
+        targets = {name_to_idx[dst] for _, dst in pairs if dst in name_to_idx}
+        if s is None or not targets:
+            unknown += len(pairs)
+            results.extend((row_id, src, dst, "") for row_id, dst in pairs)
+            continue
+        dist, _ = dijkstra_multi_target(s, adj, targets)
+        for row_id, dst in pairs:
+            t = name_to_idx.get(dst)
+            if t is None:
+                unknown += 1
+            results.append((row_id, src, dst, "" if t is None else repr(float(dist[t]))))
+
+    results.sort()
+    with open(out_path, "w", newline="") as f:
+        csv.writer(f).writerows(results)
+    return len(results), len(by_origin), unknown, perf_counter() - t0
+
+
+# ---------------- driver ---------------- #
+
+# stream the input into num_shards spill files
+# returns (rows spilled, malformed rows skipped)
+def _spill(in_path, shard_paths):
+    files = [open(p, "w", newline="") for p in shard_paths]
+    writers = [csv.writer(f) for f in files]
+    num_shards = len(shard_paths)
+    row_id = 0
+    malformed = 0
+    try:
+        with open(in_path, newline="") as f:
+            reader = csv.reader(f)
+            for row in reader:
+                if not row:
+                    continue
+                src = row[0].strip()
+                dst = row[1].strip() if len(row) > 1 else ""
+                if row_id == 0 and malformed == 0 and src.lower() == "src" and dst.lower() == "dst":
+                    continue        # header
+                if not src or not dst:
+                    malformed += 1
+                    row_id += 1
+                    continue
+                k = zlib.crc32(src.encode()) % num_shards
+                writers[k].writerow((row_id, src, dst))
+                row_id += 1
+    finally:
+        for f in files:
+            f.close()
+    return row_id - malformed, malformed
+
+
+# merge the sorted shard results into input order without loading them
+def _merge_ordered(out_paths, writer):
+    files = [open(p, newline="") for p in out_paths]
+    try:
+        streams = [((int(r[0]), r) for r in csv.reader(f)) for f in files]
+        for _, row in heapq.merge(*streams, key=lambda x: x[0]):
+            writer.writerow(row)
+    finally:
+        for f in files:
+            f.close()
+
+
+def run_batch(in_path, out_path, spec, workers=None, shards=64, ordered=False, tmpdir=None):
+    """
+    Returns stats: rows, malformed (skipped) rows, rows with an unknown airport,
+    origins (one search each), seconds per phase, rows/sec.
+    """
+    stats = {}
+    t0 = perf_counter()
+    with tempfile.TemporaryDirectory(dir=tmpdir) as tmp:
+        shard_in = [os.path.join(tmp, f"shard{k:04d}.in.csv") for k in range(shards)]
+        shard_out = [os.path.join(tmp, f"shard{k:04d}.out.csv") for k in range(shards)]
+        stats["rows"], stats["malformed"] = _spill(in_path, shard_in)
+        stats["spill_seconds"] = perf_counter() - t0
+
+        t1 = perf_counter()
+        origins = 0
+        unknown = 0
+        with open(out_path, "w", newline="") as out, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec,)) as pool:
+            writer = csv.writer(out)
+            writer.writerow(("row_id", "src", "dst", "distance"))
+            jobs = {
+                pool.submit(_process_shard, shard_in[k], shard_out[k]): k
+                for k in range(shards) if os.path.getsize(shard_in[k])
+            }
+            for job in as_completed(jobs):
+                rows, n_origins, n_unknown, _ = job.result()
+                origins += n_origins
+                unknown += n_unknown
+                k = jobs[job]
+                os.remove(shard_in[k])
+                if not ordered:
+                    # append this shard right away, keyed by row_id
+                    with open(shard_out[k], newline="") as f:
+                        writer.writerows(csv.reader(f))
+                    os.remove(shard_out[k])
+            stats["search_seconds"] = perf_counter() - t1
+
+            if ordered:
+                t2 = perf_counter()
+                _merge_ordered([shard_out[k] for k in sorted(jobs.values())], writer)
+                stats["merge_seconds"] = perf_counter() - t2
+
+    stats["origins"] = origins
+    stats["unknown"] = unknown
+    stats["seconds"] = perf_counter() - t0
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+    return stats
+
+
+# random test input: count pairs, origins drawn from num_origins airports
+def write_random_pairs(path, airports, count, num_origins=1000, seed=0):
+    rnd = random.Random(seed)
+    origins = rnd.sample(airports, min(num_origins, len(airports)))
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("src", "dst"))
+        for _ in range(count):
+            writer.writerow((rnd.choice(origins), rnd.choice(airports)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch (src, dst) distances, one search per origin")
+    parser.add_argument("pairs", help="input CSV of src,dst rows")
+    parser.add_argument("output", help="output CSV (row_id,src,dst,distance)")
+    add_graph_arguments(parser)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--shards", type=int, default=64, help="spill files (all pairs of an origin share one)")
+    parser.add_argument("--ordered", action="store_true", help="write rows in input order")
+    parser.add_argument("--tmpdir", help="directory for spill files")
+    parser.add_argument("--make-pairs", type=int, metavar="COUNT",
+                        help="first write COUNT random pairs for the chosen graph to the input file")
+    args = parser.parse_args(argv)
+
+    spec = graph_spec(args)
+    if args.make_pairs:
+        write_random_pairs(args.pairs, load_graph(spec)["airports"], args.make_pairs, seed=args.seed)
+
+    stats = run_batch(args.pairs, args.output, spec, args.workers, args.shards, args.ordered, args.tmpdir)
+    print(f"{stats['rows']} pairs, {stats['origins']} origins in {stats['seconds']:.2f} s "
+          f"({stats['rows_per_sec']:.0f} pairs/s; spill {stats['spill_seconds']:.2f} s, "
+          f"search {stats['search_seconds']:.2f} s)", file=sys.stderr)
+    if stats["malformed"] or stats["unknown"]:
+        print(f"{stats['malformed']} malformed rows skipped, "
+              f"{stats['unknown']} rows with an unknown airport (empty distance)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from time import perf_counter
+
+from algorithms_v1 import dijkstra_from_src
+from algorithms_v2 import (
+    astar,
+    bfs_from_src_list,
+    bidirectional_dijkstra,
+    dijkstra_from_src_list,
+    dijkstra_point_to_point,
+)
+from graph_list import build_reverse_adj
+from graph_matrix import build_matrix
+from synthetic_network import SyntheticNetwork
+
+# machine-readable benchmark suite
+#
+#   python bench_suite.py run --sizes 1000,10000,100000 --out results.json
+#   python bench_suite.py compare baseline.json results.json
+#
+# run: for every graph size, random (src, dst) queries per algorithm;
+#      warm-up queries first (not recorded), then `repeat` timed passes over the
+#      same queries -> per-query latency percentiles, and the coefficient of
+#      variation (CV) of the pass totals as a noise check; one extra pass under
+#      tracemalloc gives the peak Python memory per query
+# compare: matches (n, algo) rows of two result files and flags rows whose
+#      p50/p95 latency or peak memory grew by more than --threshold
+
+
+# name -> (kind, call); kind = "p2p" (src, dst query) or "sssp" (all targets from src)
+# call(g, s, t) with g = dict of the prepared graph structures (build_graph)
+ALGORITHMS = {
+    "dijkstra_p2p": ("p2p", lambda g, s, t: dijkstra_point_to_point(s, t, g["adj"])),
+    "bidirectional": ("p2p", lambda g, s, t: bidirectional_dijkstra(s, t, g["adj"], g["radj"])),
+    "astar": ("p2p", lambda g, s, t: astar(s, t, g["adj"], g["coords_idx"])),
+    "bfs": ("sssp", lambda g, s, t: bfs_from_src_list(s, g["adj"])),
+    "dijkstra_sssp": ("sssp", lambda g, s, t: dijkstra_from_src_list(s, g["adj"])),
+    "dijkstra_matrix": ("sssp", lambda g, s, t: dijkstra_from_src(s, g["matrix"])),
+}
+
+# (slower, faster) pairs whose speedup is printed when both were run on a size
+SPEEDUPS = (
+    ("dijkstra_matrix", "dijkstra_sssp"),
+    ("dijkstra_p2p", "bidirectional"),
+    ("dijkstra_p2p", "astar"),
+    ("dijkstra_sssp", "dijkstra_p2p"),
+)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return math.nan
+    k = (len(sorted_values) - 1) * q
+    lo = math.floor(k)
+    hi = math.ceil(k)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def build_graph(n, avg_degree, seed, with_matrix):
+    net = SyntheticNetwork(n, edge_prob=min(1.0, avg_degree / max(n - 1, 1)), seed=seed)
+    csr = net.to_csr()
+    # plain adjacency lists, the structure the searches are tuned for
+    adj = [list(csr[u]) for u in range(n)]
+    g = {
+        "adj": adj,
+        "radj": build_reverse_adj(adj),
+        "coords_idx": [tuple(c) for c in net.coords.tolist()],
+        "m": csr.num_edges(),
+    }
+    if with_matrix:
+        g["matrix"] = build_matrix(net.airports(), net.routes())
+    return g
+
+
+def bench_algorithm(g, call, queries, warmup, repeat):
+    for s, t in queries[:warmup]:
+        call(g, s, t)
+    queries = queries[warmup:]
+
+    latencies = []
+    totals = []
+    for _ in range(repeat):
+        t_pass = perf_counter()
+        for s, t in queries:
+            t0 = perf_counter()
+            call(g, s, t)
+            latencies.append(perf_counter() - t0)
+        totals.append(perf_counter() - t_pass)
+
+    # memory in a separate pass, tracemalloc slows allocation down a lot
+    peak = 0
+    for s, t in queries[:max(1, min(len(queries), 10))]:
+        tracemalloc.start()
+        call(g, s, t)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    latencies.sort()
+    mean_total = statistics.fmean(totals)
+    cv = statistics.pstdev(totals) / mean_total if mean_total > 0 else 0.0
+    return {
+        "queries": len(queries) * repeat,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "cv": cv,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_suite(args):
+    algos = args.algos.split(",")
+    for a in algos:
+        if a not in ALGORITHMS:
+            raise SystemExit(f"unknown algorithm {a}, choose from {', '.join(ALGORITHMS)}")
+    sizes = [int(x) for x in args.sizes.split(",")]
+
+    results = []
+    for n in sizes:
+        with_matrix = "dijkstra_matrix" in algos and n <= args.matrix_limit
+        t0 = perf_counter()
+        g = build_graph(n, args.avg_degree, args.seed, with_matrix)
+        print(f"n={n}: m={g['m']}, graph built in {perf_counter() - t0:.2f} s", file=sys.stderr)
+
+        # the same queries for every algorithm of a kind (warm-up ones first),
+        # and for every run with the same seed, so rows stay comparable
+        rnd = random.Random(args.seed)
+        pairs = {
+            kind: [(rnd.randrange(n), rnd.randrange(n)) for _ in range(count + args.warmup)]
+            for kind, count in (("p2p", args.queries), ("sssp", args.sssp_queries))
+        }
+        for algo in algos:
+            kind, call = ALGORITHMS[algo]
+            if algo == "dijkstra_matrix" and not with_matrix:
+                continue
+            row = bench_algorithm(g, call, pairs[kind], args.warmup, args.repeat)
+            row.update({"n": n, "m": g["m"], "algo": algo, "kind": kind})
+            row["noisy"] = row["cv"] > args.max_cv
+            results.append(row)
+            print(
+                f"  {algo:<16} p50 {row['p50_ms']:9.3f} ms  p95 {row['p95_ms']:9.3f} ms  "
+                f"p99 {row['p99_ms']:9.3f} ms  peak {row['peak_kib']:9.1f} KiB  "
+                f"cv {row['cv']:.3f}{'  NOISY' if row['noisy'] else ''}",
+                file=sys.stderr,
+            )
+
+        by_algo = {r["algo"]: r for r in results if r["n"] == n}
+        for slow, fast in SPEEDUPS:
+            if slow in by_algo and fast in by_algo and by_algo[fast]["mean_ms"] > 0:
+                ratio = by_algo[slow]["mean_ms"] / by_algo[fast]["mean_ms"]
+                print(f"  speedup {slow} -> {fast}: {ratio:.1f}x", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k != "func"},
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+def compare_results(args):
+    with open(args.baseline) as f:
+        base = {(r["n"], r["algo"]): r for r in json.load(f)["results"]}
+    with open(args.current) as f:
+        cur = {(r["n"], r["algo"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    for key in sorted(cur):
+        if key not in base:
+            print(f"n={key[0]:<7} {key[1]:<16} new (no baseline)")
+            continue
+        b = base[key]
+        c = cur[key]
+        flags = []
+        for metric in ("p50_ms", "p95_ms", "peak_kib"):
+            if b[metric] > 0 and c[metric] > b[metric] * (1 + args.threshold):
+                flags.append(f"{metric} +{(c[metric] / b[metric] - 1) * 100:.0f}%")
+        noisy = b.get("noisy") or c.get("noisy")
+        status = "REGRESSION " + ", ".join(flags) if flags else "ok"
+        if flags and noisy:
+            status += " (noisy, rerun to confirm)"
+        if flags:
+            regressions += 1
+        print(f"n={key[0]:<7} {key[1]:<16} p50 {b['p50_ms']:9.3f} -> {c['p50_ms']:9.3f} ms  {status}")
+    for key in sorted(set(base) - set(cur)):
+        print(f"n={key[0]:<7} {key[1]:<16} missing from current run")
+
+    print(f"{regressions} regression(s) over {args.threshold * 100:.0f}%")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Airport route benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the benchmarks and write JSON results")
+    run.add_argument("--sizes", default="1000,10000,100000", help="comma-separated airport counts")
+    run.add_argument("--avg-degree", type=float, default=4.0, help="average routes per airport")
+    run.add_argument("--algos", default="dijkstra_p2p,bidirectional,astar,bfs,dijkstra_sssp,dijkstra_matrix")
+    run.add_argument("--queries", type=int, default=200, help="recorded point-to-point queries per pass")
+    run.add_argument("--sssp-queries", type=int, default=20, help="recorded one-to-all queries per pass")
+    run.add_argument("--warmup", type=int, default=10, help="unrecorded queries before timing")
+    run.add_argument("--repeat", type=int, default=3, help="timed passes over the same queries")
+    run.add_argument("--max-cv", type=float, default=0.10, help="pass-time CV above which a row is noisy")
+    run.add_argument("--matrix-limit", type=int, default=2000, help="largest n for the adjacency-matrix run")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--out", help="JSON output file (default: stdout)")
+    run.set_defaults(func=run_suite)
+
+    cmp = sub.add_parser("compare", help="flag regressions against a stored baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    cmp.set_defaults(func=compare_results)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from time import perf_counter
+import os
 import random
 import matplotlib.pyplot as plt
 
@@ -9,6 +10,13 @@ from algorithms_v1 import (
     dijkstra_from_src,
 )
 from graph_matrix import build_matrix
+from matrix_engine import (
+    adjacency_np,
+    build_matrix_np,
+    bfs_from_src_np,
+    dfs_from_src_np,
+    dijkstra_from_src_np,
+)
 
 # Phase 2: list-based + A*
 from graph_list import (
@@ -21,7 +29,16 @@ from algorithms_v2 import (
     dfs_all_sources,
     dijkstra_all_sources,
     astar_random_pairs,
+    dijkstra_from_src_list,
+    astar,
+    many_to_many,
 )
+from step_constraint import route_min_stops_then_cost
+from kth_smallest import k_shortest_paths
+from search_stats import SearchStats
+from contraction_hierarchy import build_ch
+from parallel_runner import parallel_all_sources
+from ms_bfs import ms_bfs_hops
 
 INF = float("inf")
 
@@ -126,6 +143,55 @@ def run_performance_phase1():
     return results
 
 
+# ---------------- Phase 1 with NumPy matrix kernels ---------------- #
+
+# the boolean adjacency is built once and shared by all sources
+def bfs_all_sources_np(graph):
+    adj = adjacency_np(graph)
+    for s in range(graph.shape[0]):
+        bfs_from_src_np(s, graph, adj)
+
+
+def dfs_all_sources_np(graph):
+    adj = adjacency_np(graph)
+    for s in range(graph.shape[0]):
+        dfs_from_src_np(s, graph, adj)
+
+
+def dijkstra_all_sources_np(graph):
+    for s in range(graph.shape[0]):
+        dijkstra_from_src_np(s, graph)
+
+
+# dense regional networks: NumPy matrix kernels vs the adjacency list
+def run_performance_matrix_np(n=300, edge_probs=(0.1, 0.3, 0.6), seed=5):
+    results = []
+    for edge_prob in edge_probs:
+        airports, routes = generate_random_airports_and_routes(n, edge_prob=edge_prob, seed=seed)
+        graph = build_matrix_np(airports, routes)
+        adj, name_to_idx = build_adj_list(airports, routes)
+
+        row = {"n": n, "edge_prob": edge_prob}
+        for key, f_np, f_list, g_list in (
+            ("bfs", bfs_all_sources_np, bfs_all_sources, adj),
+            ("dfs", dfs_all_sources_np, dfs_all_sources, adj),
+            ("dijk", dijkstra_all_sources_np, dijkstra_all_sources, adj),
+        ):
+            row[f"{key}_matrix_np"], _ = time_algorithm(f_np, graph, repeat=3)
+            row[f"{key}_list"], _ = time_algorithm(f_list, g_list, repeat=3)
+        results.append(row)
+    return results
+
+
+def print_matrix_np_results(results):
+    print("all sources, NumPy matrix engine / adjacency list")
+    for r in results:
+        print(f"  n={r['n']} p={r['edge_prob']:.2f}  " + "  ".join(
+            f"{key} {r[f'{key}_matrix_np'] * 1000:8.1f} / {r[f'{key}_list'] * 1000:8.1f} ms"
+            for key in ("bfs", "dfs", "dijk")
+        ))
+
+
 # ---------------- Phase 2: coords + adj list + A* ---------------- #
 
 def build_phase2_dataset(n, edge_prob, seed):
@@ -143,7 +209,9 @@ def build_phase2_dataset(n, edge_prob, seed):
     return airports, coords, routes, adj, coords_idx
 
 
-def run_performance_phase2():
+# workers = if set, also time parallel_runner.parallel_all_sources with that many
+#           processes and report the speedup over the serial loop
+def run_performance_phase2(workers=None):
     N_SMALL = 24
     N_MEDIUM = 200
     N_LARGE = 500
@@ -162,6 +230,7 @@ def run_performance_phase2():
         )
 
         bfs_best, _ = time_algorithm(bfs_all_sources, adj, repeat=3)
+        msbfs_best, _ = time_algorithm(ms_bfs_hops, adj, repeat=3)
         dfs_best, _ = time_algorithm(dfs_all_sources, adj, repeat=3)
         dijk_best, _ = time_algorithm(dijkstra_all_sources, adj, repeat=3)
 
@@ -172,21 +241,111 @@ def run_performance_phase2():
 
         m = sum(len(nei) for nei in adj)
 
-        results.append(
-            {
-                "name": label,
-                "n": len(airports),
-                "m": m,
-                "bfs": bfs_best,
-                "dfs": dfs_best,
-                "dijk": dijk_best,
-                "astar": astar_best,
-            }
-        )
+        row = {
+            "name": label,
+            "n": len(airports),
+            "m": m,
+            "bfs": bfs_best,
+            "bfs_msbfs": msbfs_best,
+            "dfs": dfs_best,
+            "dijk": dijk_best,
+            "astar": astar_best,
+        }
+
+        if workers:
+            for key, algo in (("bfs", "bfs"), ("dfs", "dfs"), ("dijk", "dijkstra")):
+                par_best, _ = time_algorithm(parallel_all_sources, adj, algo, workers, repeat=3)
+                row[f"{key}_parallel"] = par_best
+                row[f"{key}_speedup"] = row[key] / par_best
+
+        results.append(row)
 
     return results
 
 
+# all-sources hop counts: one BFS per source vs the bit-parallel ms_bfs_hops
+def print_msbfs_speedups(results):
+    print("all-sources BFS vs multi-source BFS")
+    for r in results:
+        print(f"  {r['name']:<7} n={r['n']:<5} BFS {r['bfs'] * 1000:9.1f} ms  "
+              f"MS-BFS {r['bfs_msbfs'] * 1000:9.1f} ms  speedup {r['bfs'] / r['bfs_msbfs']:5.2f}x")
+
+
+# serial vs parallel_all_sources times of run_performance_phase2(workers=...)
+def print_parallel_speedups(results, workers):
+    print(f"all-sources searches, serial vs parallel_all_sources(workers={workers})")
+    for r in results:
+        for key, label in (("bfs", "BFS"), ("dfs", "DFS"), ("dijk", "Dijkstra")):
+            if f"{key}_parallel" in r:
+                print(f"  {r['name']:<7} n={r['n']:<5} {label:<9} serial {r[key] * 1000:9.1f} ms  "
+                      f"parallel {r[f'{key}_parallel'] * 1000:9.1f} ms  speedup {r[f'{key}_speedup']:5.2f}x")
+
+
+# ---------------- Many-to-many distance tables ---------------- #
+
+# naive loop: one full Dijkstra per origin, then read the targets
+def many_to_many_naive(sources, targets, adj):
+    table = []
+    for s in sources:
+        dist, _ = dijkstra_from_src_list(s, adj)
+        table.append([dist[t] for t in targets])
+    return table
+
+
+# table cells per second for the naive loop, the target-stopping search
+# and the bucket search on a contraction hierarchy
+def run_many_to_many_benchmark(n=1000, num_sources=50, num_targets=200, seed=4):
+    airports, coords, routes, adj, coords_idx = build_phase2_dataset(n, 3.0 / n, seed)
+    rnd = random.Random(seed)
+    sources = rnd.sample(range(n), num_sources)
+    targets = rnd.sample(range(n), num_targets)
+    cells = num_sources * num_targets
+
+    t0 = perf_counter()
+    ch = build_ch(adj)
+    ch_build = perf_counter() - t0
+
+    naive_best, _ = time_algorithm(many_to_many_naive, sources, targets, adj, repeat=3)
+    targets_best, _ = time_algorithm(many_to_many, sources, targets, adj, "targets", repeat=3)
+    buckets_best, _ = time_algorithm(many_to_many, sources, targets, adj, "buckets", ch, repeat=3)
+
+    print(f"many-to-many {num_sources} x {num_targets} on n={n} (CH preprocessing {ch_build:.2f} s)")
+    for label, t in (("naive loop", naive_best), ("stop at targets", targets_best), ("CH buckets", buckets_best)):
+        print(f"  {label:<16} {t * 1000:9.1f} ms  {cells / t:12.0f} cells/s")
+
+
+# ---------------- Search work counters ---------------- #
+
+# time each search over the same random queries twice, plain and with a SearchStats,
+# and print the counters next to the timings (totals over all queries)
+def run_search_stats_benchmark(n=500, edge_prob=0.06, num_queries=20, seed=3):
+    airports, coords, routes, adj, coords_idx = build_phase2_dataset(n, edge_prob, seed)
+    rnd = random.Random(seed)
+    queries = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(num_queries)]
+
+    searches = (
+        ("dijkstra", lambda s, t, st: dijkstra_from_src_list(s, adj, st)),
+        ("astar", lambda s, t, st: astar(s, t, adj, coords_idx, stats=st)),
+        ("min_stops", lambda s, t, st: route_min_stops_then_cost(adj, s, t, 2, st)),
+        ("k_shortest", lambda s, t, st: k_shortest_paths(adj, s, t, 5, st)),
+    )
+
+    def run_all(f, stats):
+        for s, t in queries:
+            f(s, t, stats)
+
+    print(f"search counters, n={n}, {num_queries} queries")
+    print(f"  {'search':<11} {'plain ms':>9} {'stats ms':>9} " + " ".join(f"{k:>13}" for k in SearchStats.FIELDS))
+    for label, f in searches:
+        plain_best, _ = time_algorithm(run_all, f, None, repeat=3)
+        counted_best, _ = time_algorithm(run_all, f, SearchStats(), repeat=3)
+        stats = SearchStats()
+        run_all(f, stats)
+        counts = stats.as_dict()
+        print(f"  {label:<11} {plain_best * 1000:9.1f} {counted_best * 1000:9.1f} "
+              + " ".join(f"{counts[k]:>13}" for k in SearchStats.FIELDS))
+
+
 # ---------------- Plot: Phase1 only, Phase2 only, comparison ---------------- #
 
 def plot_phase(results, title, show_astar=False):
@@ -201,6 +360,10 @@ def plot_phase(results, title, show_astar=False):
     plt.plot(Ns, dfs, marker="s", label="DFS")
     plt.plot(Ns, dijk, marker="^", label="Dijkstra")
 
+    if all("bfs_msbfs" in r for r in results_sorted):
+        msbfs = [r["bfs_msbfs"] * 1000 for r in results_sorted]
+        plt.plot(Ns, msbfs, marker="d", label="MS-BFS (bit-parallel)")
+
     if show_astar and all("astar" in r for r in results_sorted):
         astar = [r["astar"] * 1000 for r in results_sorted]
         plt.plot(Ns, astar, marker="x", label="A*")
@@ -262,7 +425,13 @@ def plot_comparison_all(phase1_results, phase2_results):
 
 if __name__ == "__main__":
     phase1_results = run_performance_phase1()
-    phase2_results = run_performance_phase2()
+    print_matrix_np_results(run_performance_matrix_np())
+    workers = os.cpu_count() or 1
+    phase2_results = run_performance_phase2(workers=workers)
+    print_msbfs_speedups(phase2_results)
+    print_parallel_speedups(phase2_results, workers)
+    run_many_to_many_benchmark()
+    run_search_stats_benchmark()
 
     plot_phase(phase1_results, "Phase 1: adjacency-matrix implementation")
     plot_phase(phase2_results, "Phase 2: adjacency-list + A* implementation", show_astar=True)
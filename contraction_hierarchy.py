@@ -0,0 +1,420 @@
+import heapq
+import tracemalloc
+from time import perf_counter
+
+INF = float("inf")
+
+# Contraction Hierarchies (CH)
+# preprocessing:
+#   1) node ordering  - contract "unimportant" nodes first (edge difference priority)
+#   2) contraction    - when node v is removed, add shortcut u -> x (weight w_uv + w_vx)
+#                       unless a witness path u -> x not through v is at least as short
+#                       stops once the remaining graph gets too dense, what is left is the core
+# query:
+#   3) bidirectional Dijkstra that only goes "up" in the order on both sides
+#      the two searches meet at the highest node of the shortest path,
+#      or continue as a plain bidirectional Dijkstra inside the core
+# shortcuts remember the node they skipped (mid), so a CH path can be unpacked
+# back into the original airport-index path
+
+
+class ContractionHierarchy:
+    def __init__(self, rank, up, down, mid, stats, core_rank=None):
+        self.rank = rank        # rank[v] = position of v in the contraction order
+        self.up = up            # up[u]   = (v, w) edges u -> v with rank[v] > rank[u]
+        self.down = down        # down[v] = (u, w) edges u -> v with rank[u] > rank[v], stored reversed
+        self.mid = mid          # mid[(u, x)] = node skipped by shortcut u -> x
+        self.stats = stats      # preprocessing time / shortcut count / memory
+        # nodes with rank >= core_rank were never contracted (the core),
+        # their up/down lists hold all core edges whatever the ranks
+        self.core_rank = len(rank) if core_rank is None else core_rank
+
+    def __len__(self):
+        return len(self.rank)
+
+
+# bounded Dijkstra from start in the remaining graph, ignoring the node being contracted
+# stops once the frontier is beyond max_d or after settle_limit settled nodes,
+# and does not expand nodes hop_limit edges away from start
+# (giving up early can only add an unnecessary shortcut, never a wrong distance)
+def _witness_search(out_edges, start, skip, max_d, settle_limit, hop_limit):
+    dist = {start: 0.0}
+    hops = {start: 0}
+    pq = [(0.0, start)]
+    settled = 0
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        if d > max_d or settled >= settle_limit:
+            break
+        settled += 1
+        h = hops[u] + 1
+        if h > hop_limit:
+            continue
+        for v, (w, _) in out_edges[u].items():
+            if v == skip:
+                continue
+            new_d = d + w
+            if new_d < dist.get(v, INF):
+                dist[v] = new_d
+                hops[v] = h
+                heapq.heappush(pq, (new_d, v))
+    return dist
+
+
+# shortcuts needed if v were contracted now: list of (u, x, weight)
+def _find_shortcuts(v, out_edges, in_edges, settle_limit, hop_limit):
+    ins = [(u, w) for u, (w, _) in in_edges[v].items()]
+    outs = [(x, w) for x, (w, _) in out_edges[v].items()]
+    shortcuts = []
+    if not outs:
+        return shortcuts, ins, outs
+
+    max_out = max(w for _, w in outs)
+    for u, w_uv in ins:
+        dist = _witness_search(out_edges, u, v, w_uv + max_out, settle_limit, hop_limit)
+        for x, w_vx in outs:
+            if x == u:
+                continue
+            d = w_uv + w_vx
+            if dist.get(x, INF) > d:
+                shortcuts.append((u, x, d))
+    return shortcuts, ins, outs
+
+
+# 2 * edge difference + number of already contracted neighbors
+# (the weighted edge difference keeps the remaining graph sparse,
+# the second term spreads contraction evenly over the graph)
+def _priority(shortcuts, ins, outs, deleted):
+    return 2 * (len(shortcuts) - len(ins) - len(outs)) + deleted
+
+
+# adj = adjacency list from build_adj_list (or a CSRGraph)
+# settle_limit / hop_limit = max nodes settled / edges followed per witness search
+# core_growth = stop contracting once the remaining graph has core_growth times
+#   more edges per node than the input; the remaining nodes form the core, they all
+#   rank above the contracted ones and keep their edges among each other in both
+#   up and down, and ch_query runs a bidirectional Dijkstra inside the core
+#   (None = contract everything; fine for road-like graphs, but on random route
+#   networks every contraction makes the rest denser and the build blows up:
+#   n = 2000 took 17 s with a full contraction, 0.4 s with the core)
+# measure_memory = trace peak Python allocations during preprocessing (slower)
+#
+# measured on SyntheticNetwork(n, edge_prob=3 / n) (random routes, ~3 per airport),
+# core_growth=1.5, single CPU, 200 random queries:
+#        n     build   core nodes   ch_query   bidirectional_dijkstra
+#     1000    0.27 s         526    0.18 ms                  0.19 ms
+#    10000     3.8 s        5374    0.89 ms                  0.83 ms
+#   100000      46 s       54012     3.1 ms                   3.3 ms
+# the build scales linearly, but random networks have no hierarchy to exploit:
+# most nodes end up in the core and queries are no faster than a bidirectional
+# Dijkstra on the input graph. The gains show up on networks with hubs or geometry
+# (road-like graphs) where the core stays small
+def build_ch(adj, settle_limit=50, hop_limit=6, core_growth=1.5, measure_memory=False):
+    if measure_memory:
+        tracemalloc.start()
+    t0 = perf_counter()
+
+    n = len(adj)
+    # remaining graph: out_edges[u][v] = (w, mid), in_edges[v][u] = (w, mid)
+    # mid = -1 for an original route, otherwise the node the shortcut skips
+    # parallel routes collapse to the cheapest one
+    # a contracted node is removed from here, its edges move to up/down
+    out_edges = [{} for _ in range(n)]
+    in_edges = [{} for _ in range(n)]
+    remaining_edges = 0
+    for u in range(n):
+        for v, w in adj[u]:
+            if v == u:
+                continue
+            old = out_edges[u].get(v)
+            if old is None:
+                remaining_edges += 1
+            if old is None or w < old[0]:
+                out_edges[u][v] = (w, -1)
+                in_edges[v][u] = (w, -1)
+
+    core_degree = None
+    if core_growth is not None:
+        core_degree = core_growth * remaining_edges / max(n, 1)
+
+    contracted = [False] * n
+    deleted = [0] * n
+    rank = [0] * n
+    up = [[] for _ in range(n)]
+    down = [[] for _ in range(n)]
+    mid = {}
+    num_edges = 0
+
+    # 1) initial node order
+    pq = []
+    for v in range(n):
+        shortcuts, ins, outs = _find_shortcuts(v, out_edges, in_edges, settle_limit, hop_limit)
+        pq.append((_priority(shortcuts, ins, outs, 0), v))
+    heapq.heapify(pq)
+
+    num_shortcuts = 0
+    order = 0
+    while pq:
+        if core_degree is not None and remaining_edges > core_degree * (n - order):
+            break
+        _, v = heapq.heappop(pq)
+        if contracted[v]:
+            continue
+
+        # lazy update: priorities go stale as neighbors get contracted
+        shortcuts, ins, outs = _find_shortcuts(v, out_edges, in_edges, settle_limit, hop_limit)
+        prio = _priority(shortcuts, ins, outs, deleted[v])
+        if pq and prio > pq[0][0]:
+            heapq.heappush(pq, (prio, v))
+            continue
+
+        # 2) contract v: insert shortcuts, keep the cheaper edge if one already exists
+        for u, x, d in shortcuts:
+            old = out_edges[u].get(x)
+            if old is None or d < old[0]:
+                if old is None:
+                    remaining_edges += 1
+                out_edges[u][x] = (d, v)
+                in_edges[x][u] = (d, v)
+                num_shortcuts += 1
+
+        # every remaining neighbor gets a higher rank than v,
+        # so v's remaining edges are final: out-edges go up, in-edges come down
+        for x, (w, m) in out_edges[v].items():
+            up[v].append((x, w))
+            if m != -1:
+                mid[(v, x)] = m
+            del in_edges[x][v]
+            deleted[x] += 1
+        for u, (w, m) in in_edges[v].items():
+            down[v].append((u, w))
+            if m != -1:
+                mid[(u, v)] = m
+            del out_edges[u][v]
+            deleted[u] += 1
+        remaining_edges -= len(up[v]) + len(down[v])
+        num_edges += len(up[v]) + len(down[v])
+        out_edges[v] = None
+        in_edges[v] = None
+
+        contracted[v] = True
+        rank[v] = order
+        order += 1
+
+    # 3) core: whatever is left, in the order of its index
+    core = 0
+    for v in range(n):
+        if contracted[v]:
+            continue
+        for x, (w, m) in out_edges[v].items():
+            up[v].append((x, w))
+            down[x].append((v, w))
+            if m != -1:
+                mid[(v, x)] = m
+        num_edges += len(out_edges[v])
+        rank[v] = order
+        order += 1
+        core += 1
+
+    stats = {
+        "nodes": n,
+        "core_nodes": core,
+        "shortcuts": num_shortcuts,
+        "edges": num_edges,
+        "preprocess_seconds": perf_counter() - t0,
+    }
+    if measure_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats["peak_memory_bytes"] = peak
+
+    return ContractionHierarchy(rank, up, down, mid, stats, n - core)
+
+
+# one side of the query below the core: full upward Dijkstra from start,
+# core nodes get a distance but are not expanded
+# (upward search spaces are small, so no stopping rule is needed)
+def _search_below_core(graph, start, rank, core_rank):
+    dist = {start: 0}
+    prev = {start: -1}
+    pq = [(0, start)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u] or rank[u] >= core_rank:
+            continue
+        for v, w in graph[u]:
+            new_d = d + w
+            if new_d < dist.get(v, INF):
+                dist[v] = new_d
+                prev[v] = u
+                heapq.heappush(pq, (new_d, v))
+    return dist, prev
+
+
+# one step of the bidirectional Dijkstra inside the core
+# returns the updated (best meeting distance, meeting node)
+def _core_step(pq, dist, prev, graph, other_dist, best):
+    d, u = heapq.heappop(pq)
+    if d > dist[u]:
+        return best
+    mu, meet = best
+    for v, w in graph[u]:
+        new_d = d + w
+        if new_d < dist.get(v, INF):
+            dist[v] = new_d
+            prev[v] = u
+            heapq.heappush(pq, (new_d, v))
+            if v in other_dist and new_d + other_dist[v] < mu:
+                mu, meet = new_d + other_dist[v], v
+    return mu, meet
+
+
+# expand the shortcut u -> x into original edges (iterative, shortcuts can nest deeply)
+def _unpack_edge(ch, u, x, path):
+    stack = [(u, x)]
+    while stack:
+        a, b = stack.pop()
+        m = ch.mid.get((a, b))
+        if m is None:
+            path.append(b)
+        else:
+            stack.append((m, b))
+            stack.append((a, m))
+
+
+# returns (distance, path) like reconstruct_path, path uses original airport indices
+# or (INF, None) if dst is unreachable
+# 1) upward searches from src and dst below the core; every node both reach is a
+#    candidate meeting point (the highest node of a path that avoids the core)
+# 2) bidirectional Dijkstra in the core, each side starting from the core nodes its
+#    upward search reached; stops once the two heap tops add up to the best meeting
+def ch_query(ch, src, dst):
+    if src == dst:
+        return 0, [src]
+
+    rank = ch.rank
+    core_rank = ch.core_rank
+    dist_f, prev_f = _search_below_core(ch.up, src, rank, core_rank)
+    dist_b, next_b = _search_below_core(ch.down, dst, rank, core_rank)
+
+    best = (INF, -1)
+    small, large = (dist_f, dist_b) if len(dist_f) <= len(dist_b) else (dist_b, dist_f)
+    for v, d in small.items():
+        if v in large and d + large[v] < best[0]:
+            best = (d + large[v], v)
+
+    pq_f = [(d, v) for v, d in dist_f.items() if rank[v] >= core_rank]
+    pq_b = [(d, v) for v, d in dist_b.items() if rank[v] >= core_rank]
+    heapq.heapify(pq_f)
+    heapq.heapify(pq_b)
+    while pq_f and pq_b and pq_f[0][0] + pq_b[0][0] < best[0]:
+        if pq_f[0][0] <= pq_b[0][0]:
+            best = _core_step(pq_f, dist_f, prev_f, ch.up, dist_b, best)
+        else:
+            best = _core_step(pq_b, dist_b, next_b, ch.down, dist_f, best)
+
+    mu, meet = best
+    if meet == -1:
+        return INF, None
+
+    # CH path: src ... meet via forward tree, meet ... dst via backward tree
+    ch_path = []
+    cur = meet
+    while cur != -1:
+        ch_path.append(cur)
+        cur = prev_f[cur]
+    ch_path.reverse()
+    cur = next_b[meet]
+    while cur != -1:
+        ch_path.append(cur)
+        cur = next_b[cur]
+
+    path = [src]
+    for i in range(len(ch_path) - 1):
+        _unpack_edge(ch, ch_path[i], ch_path[i + 1], path)
+    return mu, path
+
+
+# bucket-based many-to-many on the hierarchy, same split as ch_query
+# 1) one backward search below the core per target t; every contracted node v it
+#    reaches gets (j, d(v, t)) appended to bucket[v], every core node c it reaches
+#    (an entry of t into the core) gets (j, d(c, t)) appended to core_bucket[c]
+# 2) per source s: a forward search below the core, scanning bucket[u] at every
+#    contracted node u it reaches: d(s, t_j) = min(d(s, u) + d(u, t_j))
+# 3) then one Dijkstra inside the core, started from the core nodes the forward
+#    search reached, scanning core_bucket[c] at every settled c; it stops once all
+#    core_bucket nodes are settled, so it never runs past the targets' core entries
+# the backward work is done once and shared by all sources
+# out = len(sources) x len(targets) array to fill (initialized to INF by the caller)
+def ch_many_to_many(ch, sources, targets, out):
+    rank = ch.rank
+    core_rank = ch.core_rank
+    buckets = {}
+    core_buckets = {}
+    for j, t in enumerate(targets):
+        dist_b, _ = _search_below_core(ch.down, t, rank, core_rank)
+        for v, d in dist_b.items():
+            into = core_buckets if rank[v] >= core_rank else buckets
+            into.setdefault(v, []).append((j, d))
+
+    for i, s in enumerate(sources):
+        best = [INF] * len(targets)
+        dist_f, _ = _search_below_core(ch.up, s, rank, core_rank)
+        for u, d_f in dist_f.items():
+            bucket = buckets.get(u)
+            if bucket is None:
+                continue
+            for j, d_b in bucket:
+                if d_f + d_b < best[j]:
+                    best[j] = d_f + d_b
+
+        if core_buckets:
+            dist = {v: d for v, d in dist_f.items() if rank[v] >= core_rank}
+            pq = [(d, v) for v, d in dist.items()]
+            heapq.heapify(pq)
+            remaining = len(core_buckets)
+            while pq:
+                d, u = heapq.heappop(pq)
+                if d > dist[u]:
+                    continue
+                bucket = core_buckets.get(u)
+                if bucket is not None:
+                    for j, d_b in bucket:
+                        if d + d_b < best[j]:
+                            best[j] = d + d_b
+                    remaining -= 1
+                    if not remaining:
+                        break
+                for v, w in ch.up[u]:
+                    new_d = d + w
+                    if new_d < dist.get(v, INF):
+                        dist[v] = new_d
+                        heapq.heappush(pq, (new_d, v))
+        out[i] = best
+    return out
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+
+    from synthetic_network import SyntheticNetwork
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    csr = SyntheticNetwork(n, edge_prob=3.0 / n, seed=11).to_csr()
+    adj = [list(csr[u]) for u in range(n)]
+
+    ch = build_ch(adj, measure_memory=True)
+    s = ch.stats
+    print(f"nodes={s['nodes']} core={s['core_nodes']} edges={s['edges']} shortcuts={s['shortcuts']}")
+    print(f"preprocessing: {s['preprocess_seconds']:.2f} s, peak memory {s['peak_memory_bytes'] / 1e6:.1f} MB")
+
+    rnd = random.Random(0)
+    num_queries = 1000
+    t0 = perf_counter()
+    for _ in range(num_queries):
+        ch_query(ch, rnd.randrange(n), rnd.randrange(n))
+    t1 = perf_counter()
+    print(f"average query: {(t1 - t0) / num_queries * 1000:.3f} ms")
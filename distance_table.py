@@ -0,0 +1,135 @@
+import struct
+from time import perf_counter
+
+import numpy as np
+
+from algorithms_v2 import dijkstra_from_src_list
+
+INF = float("inf")
+
+# persistent all-pairs table: answer "distance / route from A to B" with no search at all
+#
+# file layout (little endian):
+#   header (32 bytes): magic, version, n, bytes per next-hop entry
+#   dist:  n * n float32     dist[s][t] = shortest distance s -> t (inf if unreachable)
+#   nxt:   n * n int16/int32 nxt[s][t]  = first airport after s on that route (-1 if unreachable)
+#
+# the file is opened with np.memmap, so the OS page cache holds one copy
+# that every worker process shares, and a lookup only touches the pages it needs
+
+_MAGIC = b"ARSAPSP\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIII8x")
+
+
+# int16 is enough for up to 32767 airports, then int32
+def _next_hop_dtype(n):
+    return np.int16 if n < 2 ** 15 else np.int32
+
+
+# first hop from s towards every node, from the prev array of one Dijkstra run
+def _next_hops_from_prev(s, prev):
+    n = len(prev)
+    nh = [-1] * n
+    nh[s] = s
+    for v in range(n):
+        if nh[v] != -1 or prev[v] == -1:
+            continue
+        # climb the tree until a node whose hop is known, then fill the chain
+        chain = []
+        cur = v
+        while nh[cur] == -1 and prev[cur] != s:
+            chain.append(cur)
+            cur = prev[cur]
+        hop = nh[cur] if nh[cur] != -1 else cur
+        nh[cur] = hop
+        for x in chain:
+            nh[x] = hop
+    return nh
+
+
+# adj = adjacency list from build_adj_list (or a CSRGraph)
+# rows are written one source at a time, so only one dist/prev pair is in RAM
+def build_distance_table(adj, path):
+    n = len(adj)
+    nh_dtype = _next_hop_dtype(n)
+    itemsize = np.dtype(nh_dtype).itemsize
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, n, itemsize, 0))
+        f.truncate(_HEADER.size + n * n * (4 + itemsize))
+
+    dist_mm = np.memmap(path, dtype=np.float32, mode="r+", offset=_HEADER.size, shape=(n, n))
+    nxt_mm = np.memmap(path, dtype=nh_dtype, mode="r+", offset=_HEADER.size + n * n * 4, shape=(n, n))
+    for s in range(n):
+        dist, prev = dijkstra_from_src_list(s, adj)
+        dist_mm[s] = dist
+        nxt_mm[s] = _next_hops_from_prev(s, prev)
+    dist_mm.flush()
+    nxt_mm.flush()
+    del dist_mm, nxt_mm
+
+
+class DistanceTable:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, n, itemsize, _ = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a distance table file")
+        if version != _VERSION:
+            raise ValueError(f"unsupported distance table version {version}")
+        nh_dtype = np.int16 if itemsize == 2 else np.int32
+
+        self.n = n
+        # read-only mappings, nothing is copied into process memory
+        self.dist = np.memmap(path, dtype=np.float32, mode="r", offset=_HEADER.size, shape=(n, n))
+        self.nxt = np.memmap(path, dtype=nh_dtype, mode="r", offset=_HEADER.size + n * n * 4, shape=(n, n))
+
+    def __len__(self):
+        return self.n
+
+    def distance(self, s, t):
+        return float(self.dist[s, t])
+
+    # same result shape as reconstruct_path: list of airport indices or None
+    # walks next hops, reading one entry per hop
+    def path(self, s, t):
+        if self.nxt[s, t] == -1:
+            return None
+        path = [s]
+        cur = s
+        while cur != t:
+            cur = int(self.nxt[cur, t])
+            path.append(cur)
+        return path
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    from graph_list import (
+        generate_airports_coords_and_routes_phase2,
+        build_adj_list,
+    )
+
+    n = 500
+    airports, coords, routes = generate_airports_coords_and_routes_phase2(n=n, edge_prob=0.02, seed=3)
+    adj, name_to_idx = build_adj_list(airports, routes)
+
+    path = os.path.join(tempfile.gettempdir(), "airport_apsp.bin")
+    t0 = perf_counter()
+    build_distance_table(adj, path)
+    t1 = perf_counter()
+    table = DistanceTable(path)
+    t2 = perf_counter()
+    print(f"build {t1 - t0:.2f} s, load {(t2 - t1) * 1000:.3f} ms, file {os.path.getsize(path) / 1e6:.1f} MB")
+
+    rnd = random.Random(0)
+    pairs = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(100000)]
+    t0 = perf_counter()
+    for s, t in pairs:
+        table.distance(s, t)
+    t1 = perf_counter()
+    print(f"lookup: {(t1 - t0) / len(pairs) * 1e6:.2f} us per pair")
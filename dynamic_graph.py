@@ -0,0 +1,174 @@
+import heapq
+
+from algorithms_v2 import dijkstra_from_src_list, reconstruct_path
+
+INF = float("inf")
+
+# mutable route network that keeps shortest-path trees up to date
+#
+# build_adj_list + dijkstra_from_src_list can only start over after a change.
+# here every tree that was asked for ("hot" sources) is repaired in place
+# (Ramalingam-Reps style dynamic SSSP):
+#   - cheaper or new route u -> v: if it shortens v, run Dijkstra starting at v only
+#   - dearer or removed route u -> v: nothing to do unless it is a tree edge
+#     (prev[v] == u); then only v's subtree loses its distances, each of those
+#     nodes is re-seeded from its best unaffected in-neighbor, and Dijkstra
+#     runs over that subtree
+# nodes outside the affected part are never touched
+
+
+class DynamicGraph:
+    def __init__(self, airports, routes):
+        self.airports = list(airports)
+        self.name_to_idx = {name: i for i, name in enumerate(self.airports)}
+        n = len(self.airports)
+        self.out = [{} for _ in range(n)]     # out[u][v] = w
+        self.inn = [{} for _ in range(n)]     # inn[v][u] = w
+        for src, dst, w in routes:
+            u = self.name_to_idx[src]
+            v = self.name_to_idx[dst]
+            # parallel routes collapse to the cheapest one
+            if w < self.out[u].get(v, INF):
+                self.out[u][v] = w
+                self.inn[v][u] = w
+        self.trees = {}     # source -> (dist, prev)
+        self.version = 0    # bumped on every change
+
+    # adjacency-list interface, so algorithms_v2 functions accept the graph directly
+    def __len__(self):
+        return len(self.out)
+
+    def __getitem__(self, u):
+        return self.out[u].items()
+
+    # shortest-path tree from src, computed once and then kept up to date
+    def tree(self, src):
+        t = self.trees.get(src)
+        if t is None:
+            t = dijkstra_from_src_list(src, self)
+            self.trees[src] = t
+        return t
+
+    # returns (distance, path) like reconstruct_path, (INF, None) if unreachable
+    def query(self, src, dst):
+        dist, prev = self.tree(src)
+        if dist[dst] == INF:
+            return INF, None
+        return dist[dst], reconstruct_path(src, dst, prev)
+
+    def drop_tree(self, src):
+        self.trees.pop(src, None)
+
+    # ---------------- updates ---------------- #
+
+    def add_route(self, u, v, w):
+        if v in self.out[u]:
+            raise ValueError(f"route {u} -> {v} already exists, use update_weight")
+        self._set_edge(u, v, w)
+        for dist, prev in self.trees.values():
+            self._decrease(dist, prev, u, v, w)
+
+    def remove_route(self, u, v):
+        if v not in self.out[u]:
+            raise ValueError(f"route {u} -> {v} does not exist")
+        del self.out[u][v]
+        del self.inn[v][u]
+        self.version += 1
+        for dist, prev in self.trees.values():
+            if prev[v] == u:
+                self._repair_subtree(dist, prev, v)
+
+    def update_weight(self, u, v, w):
+        old = self.out[u].get(v)
+        if old is None:
+            raise ValueError(f"route {u} -> {v} does not exist")
+        self._set_edge(u, v, w)
+        for dist, prev in self.trees.values():
+            if w < old:
+                self._decrease(dist, prev, u, v, w)
+            elif w > old and prev[v] == u:
+                self._repair_subtree(dist, prev, v)
+
+    def _set_edge(self, u, v, w):
+        self.out[u][v] = w
+        self.inn[v][u] = w
+        self.version += 1
+
+    # ---------------- tree repair ---------------- #
+
+    # Dijkstra that starts from an already seeded heap
+    # only nodes whose distance actually improves are pushed
+    def _propagate(self, dist, prev, pq):
+        out = self.out
+        while pq:
+            d, x = heapq.heappop(pq)
+            if d > dist[x]:
+                continue
+            for y, w in out[x].items():
+                new_d = d + w
+                if new_d < dist[y]:
+                    dist[y] = new_d
+                    prev[y] = x
+                    heapq.heappush(pq, (new_d, y))
+
+    def _decrease(self, dist, prev, u, v, w):
+        new_d = dist[u] + w
+        if new_d < dist[v]:
+            dist[v] = new_d
+            prev[v] = u
+            self._propagate(dist, prev, [(new_d, v)])
+
+    def _repair_subtree(self, dist, prev, root):
+        # collect root and everything hanging below it in the tree
+        affected = [root]
+        in_subtree = {root}
+        i = 0
+        while i < len(affected):
+            x = affected[i]
+            i += 1
+            for y in self.out[x]:
+                if prev[y] == x and y not in in_subtree:
+                    in_subtree.add(y)
+                    affected.append(y)
+
+        for x in affected:
+            dist[x] = INF
+            prev[x] = -1
+
+        # best entry into each affected node from the part of the tree that is still valid
+        pq = []
+        for x in affected:
+            best, best_p = INF, -1
+            for p, w in self.inn[x].items():
+                if p not in in_subtree and dist[p] + w < best:
+                    best, best_p = dist[p] + w, p
+            if best_p != -1:
+                dist[x] = best
+                prev[x] = best_p
+                pq.append((best, x))
+        heapq.heapify(pq)
+        self._propagate(dist, prev, pq)
+
+
+if __name__ == "__main__":
+    import random
+    from time import perf_counter
+
+    from graph_list import generate_airports_coords_and_routes_phase2
+
+    n = 20000
+    airports, coords, routes = generate_airports_coords_and_routes_phase2(n=n, edge_prob=4.0 / n, seed=2)
+    g = DynamicGraph(airports, routes)
+    hot = [0, 1, 2, 3, 4]
+    for s in hot:
+        g.tree(s)
+
+    rnd = random.Random(0)
+    edges = [(u, v) for u in range(n) for v in g.out[u]]
+    t0 = perf_counter()
+    num_updates = 200
+    for _ in range(num_updates):
+        u, v = rnd.choice(edges)
+        g.update_weight(u, v, g.out[u][v] * rnd.uniform(0.5, 1.5))
+    t1 = perf_counter()
+    print(f"{(t1 - t0) / num_updates * 1000:.3f} ms per weight change ({len(hot)} hot trees, n={n})")
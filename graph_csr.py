@@ -0,0 +1,107 @@
+from array import array
+
+# compressed sparse row (CSR) graph
+# same information as the adjacency list from build_adj_list, but stored in three flat arrays:
+#   offsets[u] .. offsets[u + 1]  = slice of targets/weights that belongs to node u
+#   targets[i]                    = neighbor index of edge i
+#   weights[i]                    = distance of edge i
+# a list of (v, w) tuples costs ~100+ bytes per edge, here an edge costs 4 + 8 = 12 bytes
+class CSRGraph:
+    def __init__(self, offsets, targets, weights):
+        # any buffer that supports len() / indexing / slicing works here
+        # (array.array, memoryview, numpy arrays)
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    # number of nodes, so len(adj) works like for the adjacency list
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # adj[u] yields (v, w) pairs just like adj[u] in the adjacency list
+    # so bfs/dfs/dijkstra/A*/Yen can loop over it unchanged
+    def __getitem__(self, u):
+        a = self.offsets[u]
+        b = self.offsets[u + 1]
+        return zip(self.targets[a:b], self.weights[a:b])
+
+    def __iter__(self):
+        for u in range(len(self)):
+            yield self[u]
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def num_edges(self):
+        return len(self.targets)
+
+    # bytes used by the three buffers
+    def memory_bytes(self):
+        total = 0
+        for buf in (self.offsets, self.targets, self.weights):
+            total += len(buf) * buf.itemsize
+        return total
+
+    # graph with every edge flipped (v -> u), used by backward searches
+    def reverse(self):
+        n = len(self)
+        src = array("i", bytes(4 * self.num_edges()))
+        for u in range(n):
+            for i in range(self.offsets[u], self.offsets[u + 1]):
+                src[i] = u
+        return _csr_from_edge_arrays(n, self.targets, src, self.weights)
+
+
+# fill CSR arrays from parallel edge arrays with a counting sort on the source node
+# edges keep their original relative order, so every node sees its neighbors
+# in the same order as in build_adj_list (same tie-breaking in the searches)
+def _csr_from_edge_arrays(n, src, dst, wts):
+    m = len(src)
+    offsets = array("q", bytes(8 * (n + 1)))
+    for u in src:
+        offsets[u + 1] += 1
+    for u in range(n):
+        offsets[u + 1] += offsets[u]
+
+    targets = array("i", bytes(4 * m))
+    weights = array("d", bytes(8 * m))
+    pos = array("q", offsets[:n])       # next free slot per node
+    for i in range(m):
+        u = src[i]
+        p = pos[u]
+        targets[p] = dst[i]
+        weights[p] = wts[i]
+        pos[u] = p + 1
+
+    return CSRGraph(offsets, targets, weights)
+
+
+# build CSR straight from (src, dst, w) route tuples, same signature as build_adj_list
+# returns (csr, name_to_idx)
+def build_csr(airports, routes):
+    name_to_idx = {name: i for i, name in enumerate(airports)}
+    n = len(airports)
+
+    src = array("i")
+    dst = array("i")
+    wts = array("d")
+    for s, d, w in routes:
+        src.append(name_to_idx[s])
+        dst.append(name_to_idx[d])
+        wts.append(w)
+
+    return _csr_from_edge_arrays(n, src, dst, wts), name_to_idx
+
+
+# convert an existing adjacency list (list of lists of (v, w)) to CSR
+def csr_from_adj_list(adj):
+    n = len(adj)
+    offsets = array("q", [0])
+    targets = array("i")
+    weights = array("d")
+    for u in range(n):
+        for v, w in adj[u]:
+            targets.append(v)
+            weights.append(w)
+        offsets.append(len(targets))
+    return CSRGraph(offsets, targets, weights)
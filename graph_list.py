@@ -61,6 +61,16 @@ def build_adj_list(airports, routes):
 
     return adj, name_to_idx
 
+# flip every edge of an adjacency list (u -> v becomes v -> u)
+# used by searches that run backward from the destination
+def build_reverse_adj(adj):
+    n = len(adj)
+    radj = [[] for _ in range(n)]
+    for u in range(n):
+        for v, w in adj[u]:
+            radj[v].append((u, w))
+    return radj
+
 # convert coords dictionary to list indexed by airport index
 def build_coords_idx(airports, coords):
     coords_idx = [None] * len(airports)
@@ -0,0 +1,127 @@
+import math
+import random
+from array import array
+from collections import OrderedDict
+from time import perf_counter
+
+import numpy as np
+
+from algorithms_v2 import astar, astar_potential
+
+INF = float("inf")
+EARTH_RADIUS_MILES = 3958.8
+
+# great-circle distance in miles between two (lon, lat) points in degrees
+def haversine_miles(lon1, lat1, lon2, lat2):
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+# same formula on NumPy arrays (one call for many points)
+# lon/lat inputs in degrees, broadcasting works as usual
+def haversine_miles_np(lon1, lat1, lon2, lat2):
+    lon1 = np.radians(lon1)
+    lat1 = np.radians(lat1)
+    lon2 = np.radians(lon2)
+    lat2 = np.radians(lat2)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# precomputed A* potentials "distance from every node to target"
+# metric = "haversine" for (lon, lat) coords (main.load_real_airport_data)
+#          "euclidean" for the synthetic x/y map from graph_list
+# the raw distance is multiplied by scale = min over routes of (w / distance(u, v))
+# so h(u) - h(v) <= w(u, v) for every route: h stays admissible (and consistent)
+# in the units of the route weights, even if some routes are shorter than the metric says
+class GreatCircleHeuristic:
+    def __init__(self, coords_idx, adj=None, metric="haversine", cache_size=64, scale=None):
+        self.x = np.array([c[0] for c in coords_idx], dtype=np.float64)
+        self.y = np.array([c[1] for c in coords_idx], dtype=np.float64)
+        self.metric = metric
+        self.cache_size = cache_size
+        self.cache = OrderedDict()      # target -> array('d') of potentials, LRU order
+        self.hits = 0
+        self.misses = 0
+        if scale is None:
+            scale = 1.0 if adj is None else self._admissible_scale(adj)
+        self.scale = scale
+
+    def _distance(self, x1, y1, x2, y2):
+        if self.metric == "haversine":
+            return haversine_miles_np(x1, y1, x2, y2)
+        return np.hypot(x1 - x2, y1 - y2)
+
+    # largest factor that keeps scale * distance(u, v) <= w(u, v) on every route
+    def _admissible_scale(self, adj):
+        src = []
+        dst = []
+        wts = []
+        for u in range(len(adj)):
+            for v, w in adj[u]:
+                src.append(u)
+                dst.append(v)
+                wts.append(w)
+        if not src:
+            return 1.0
+        src = np.array(src)
+        dst = np.array(dst)
+        d = self._distance(self.x[src], self.y[src], self.x[dst], self.y[dst])
+        ratio = np.array(wts, dtype=np.float64)[d > 0] / d[d > 0]
+        if ratio.size == 0:
+            return 1.0
+        return float(ratio.min())
+
+    # potentials for one target, computed in a single vectorized pass
+    # most recently used targets are kept, the oldest one is dropped past cache_size
+    def potentials(self, target):
+        pot = self.cache.get(target)
+        if pot is not None:
+            self.hits += 1
+            self.cache.move_to_end(target)
+            return pot
+
+        self.misses += 1
+        d = self._distance(self.x, self.y, self.x[target], self.y[target]) * self.scale
+        pot = array("d")
+        pot.frombytes(d.tobytes())      # flat float64 buffer, cheap pot[v] lookups
+        self.cache[target] = pot
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return pot
+
+
+if __name__ == "__main__":
+    from graph_list import (
+        generate_airports_coords_and_routes_phase2,
+        build_adj_list,
+        build_coords_idx,
+    )
+
+    n = 2000
+    airports, coords, routes = generate_airports_coords_and_routes_phase2(
+        n=n,
+        edge_prob=4.0 / n,
+        seed=3,
+    )
+    adj, name_to_idx = build_adj_list(airports, routes)
+    coords_idx = build_coords_idx(airports, coords)
+    provider = GreatCircleHeuristic(coords_idx, adj, metric="euclidean")
+    print(f"admissible scale: {provider.scale:.3f}")
+
+    rnd = random.Random(0)
+    targets = [rnd.randrange(n) for _ in range(20)]
+    pairs = [(rnd.randrange(n), rnd.choice(targets)) for _ in range(200)]
+
+    t0 = perf_counter()
+    for s, t in pairs:
+        astar(s, t, adj, coords_idx)
+    t1 = perf_counter()
+    for s, t in pairs:
+        astar_potential(s, t, adj, provider.potentials(t))
+    t2 = perf_counter()
+    print(f"per-push heuristic: {(t1 - t0) * 1000:.1f} ms, cached potentials: {(t2 - t1) * 1000:.1f} ms")
+    print(f"cache hits={provider.hits} misses={provider.misses}")
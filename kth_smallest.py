@@ -1,14 +1,16 @@
 # priority queue for candidate paths
 import heapq
 import random
+from itertools import islice
 # for visualization
 import matplotlib.pyplot as plt
 
-from algorithms_v2 import dijkstra_from_src_list
+from algorithms_v2 import bfs_from_src_list, dijkstra_from_src_list
 from graph_list import (
     generate_airports_coords_and_routes_phase2,
     build_adj_list,
     build_coords_idx,
+    build_reverse_adj,
 )
 
 INF = float("inf")
@@ -46,69 +48,170 @@ def path_cost(path, adj):
     return cost
 
 
-def k_shortest_paths(adj, src, dst, K):
-    dist0, prev0 = dijkstra_from_src_list(src, adj)
-    if dist0[dst] == INF:
-        return []
-
-    p0 = reconstruct_path(src, dst, prev0)
-    if p0 is None:
-        return []
-
-    A = [p0]  # founded shortest paths
-    B = []    # candidate paths (min-heap on total cost)
+# spur search for Yen: A* from spur to dst that stops as soon as dst is settled
+# pot[v] = exact distance v -> dst in the full graph; removing edges/nodes only makes
+#          distances longer, so it stays a consistent lower bound in the banned graph
+#          and the search heads straight for dst
+# banned[v] = True for root-path nodes, banned_next = out-edges of spur that are removed
+# returns (cost, path, cum) with cum[j] = cost of path[0..j], or (INF, None, None)
+def _spur_search(spur, dst, adj, pot, banned, banned_next):
+    g = {spur: 0.0}
+    prev = {spur: -1}
+    pq = [(pot[spur], 0.0, spur)]
+    while pq:
+        f, cur_g, u = heapq.heappop(pq)
+        if cur_g > g[u]:
+            continue
+        if u == dst:
+            path = reconstruct_path(spur, dst, prev)
+            return cur_g, path, [g[x] for x in path]
+        for v, w in adj[u]:
+            if banned[v] or (u == spur and v in banned_next):
+                continue
+            new_g = cur_g + w
+            if new_g < g.get(v, INF):
+                g[v] = new_g
+                prev[v] = u
+                heapq.heappush(pq, (new_g + pot[v], new_g, v))
+    return INF, None, None
+
+
+# _spur_search with SearchStats counters (same results)
+def _spur_search_counted(spur, dst, adj, pot, banned, banned_next, stats):
+    g = {spur: 0.0}
+    prev = {spur: -1}
+    pq = [(pot[spur], 0.0, spur)]
+    pushes = 1
+    pops = stale = relax = settled = 0
+    peak = 1
+    stats.spur_searches += 1
+    result = INF, None, None
+    while pq:
+        f, cur_g, u = heapq.heappop(pq)
+        pops += 1
+        if cur_g > g[u]:
+            stale += 1
+            continue
+        settled += 1
+        if u == dst:
+            path = reconstruct_path(spur, dst, prev)
+            result = cur_g, path, [g[x] for x in path]
+            break
+        for v, w in adj[u]:
+            relax += 1
+            if banned[v] or (u == spur and v in banned_next):
+                continue
+            new_g = cur_g + w
+            if new_g < g.get(v, INF):
+                g[v] = new_g
+                prev[v] = u
+                heapq.heappush(pq, (new_g + pot[v], new_g, v))
+                pushes += 1
+                if len(pq) > peak:
+                    peak = len(pq)
+    stats.record(pushes, pops, stale, relax, settled, peak)
+    return result
+
+
+# lazy Yen: yields (cost, path) in nondecreasing cost order, one path per next()
+# nothing is computed ahead of time: the spur searches of a path only run when
+# the caller asks for the path after it, and all candidates found so far are kept,
+# so the 11th path costs only the work for the 10th path's spurs
+#
+#   for cost, path in iter_shortest_paths(adj, src, dst):
+#       if good_enough(path):
+#           break
+#
+# bans are masks for this query only (the adjacency list is never copied),
+# each accepted path keeps its prefix costs so root costs are not recomputed,
+# and candidates already seen are not pushed again
+#
+# stats = optional search_stats.SearchStats: counts the reverse Dijkstra and every
+#         spur search (the first path's search from src included)
+def iter_shortest_paths(adj, src, dst, stats=None):
+    n = len(adj)
+    if stats is None:
+        spur_search = _spur_search
+    else:
+        def spur_search(*args):
+            return _spur_search_counted(*args, stats)
 
-    for _ in range(1, K):
-        last_path = A[-1]  # work on the newly added path
-        n = len(last_path)
+    # distances to dst, computed once on the reverse graph
+    pot, _ = dijkstra_from_src_list(dst, build_reverse_adj(adj), stats)
+    if pot[src] == INF:
+        return
 
-        for i in range(n - 1):  # the last nodes cannot be spurred
+    banned = [False] * n
+    c0, p0, cum0 = spur_search(src, dst, adj, pot, banned, ())
+    if p0 is None:
+        return
+
+    A = [p0]            # founded shortest paths
+    B = []              # candidate paths (min-heap on total cost), with their prefix costs
+    seen = {tuple(p0)}  # every path ever put in A or B
+    yield c0, p0
+
+    last_path = p0
+    last_cum = cum0
+    while True:
+        sharing = A     # founded paths that share the current root with last_path
+        for i in range(len(last_path) - 1):   # the last node cannot be spurred
             spur = last_path[i]
-            root_path = last_path[: i + 1]  # determined path before spurred node
-
-            # copy the adjacency list
-            adj_modified = [list(neigh) for neigh in adj]
+            root_path = last_path[: i + 1]
+            if i > 0:
+                banned[last_path[i - 1]] = True   # root nodes (except spur) are off limits
 
-            # remove path after the prefix root_path for all already founded paths
-            for p in A:
-                if len(p) > i and p[: i + 1] == root_path:
-                    u = p[i]
-                    v = p[i + 1]
-                    adj_modified[u] = [(x, w) for (x, w) in adj_modified[u] if x != v]
+            # remove the next edge of every found path that shares this root
+            # (the root grows by one node per step, so just filter the previous list)
+            sharing = [p for p in sharing if len(p) > i + 1 and p[i] == spur]
+            banned_next = {p[i + 1] for p in sharing}
 
-            dist_spur, prev_spur = dijkstra_from_src_list(spur, adj_modified)
-            if dist_spur[dst] == INF:
-                continue
-
-            spur_path = reconstruct_path(spur, dst, prev_spur)
+            spur_cost, spur_path, spur_cum = spur_search(spur, dst, adj, pot, banned, banned_next)
             if spur_path is None:
                 continue
 
             total_path = root_path[:-1] + spur_path
-            c = path_cost(total_path, adj)
-            heapq.heappush(B, (c, total_path))
+            key = tuple(total_path)
+            if key in seen:
+                continue
+            seen.add(key)
+            root_cost = last_cum[i]
+            total_cum = last_cum[:i] + [root_cost + c for c in spur_cum]
+            heapq.heappush(B, (root_cost + spur_cost, total_path, total_cum))
+
+        for v in last_path:
+            banned[v] = False
 
         if not B:
-            break
+            return
 
-        cost_k, path_k = heapq.heappop(B)
-        A.append(path_k)
+        cost_k, last_path, last_cum = heapq.heappop(B)
+        A.append(last_path)
+        yield cost_k, last_path
 
-    return A
 
+# first K paths of iter_shortest_paths (Yen's algorithm)
+def k_shortest_paths(adj, src, dst, K, stats=None):
+    return [path for _, path in islice(iter_shortest_paths(adj, src, dst, stats), K)]
 
-def find_connected_pair(adj, max_trials=300):
+
+# random (src, dst) with a route between them, (None, None) if there is none
+# index = prebuilt reachability.ReachabilityIndex: uniform over all connected pairs,
+#         no traversal (the index holds a C x C bit closure, build it once and reuse it)
+# without an index: random sources, one BFS each (O(n) memory) until one reaches
+# another airport (at most max_trials), then a random airport it reaches
+def find_connected_pair(adj, max_trials=300, rnd=random, index=None):
+    if index is not None:
+        return index.sample_connected_pair(rnd)
     n = len(adj)
+    if n < 2:
+        return None, None
     for _ in range(max_trials):
-        s = random.randrange(n)
-        t = random.randrange(n)
-        if s == t:
-            continue
-        dist, prev = dijkstra_from_src_list(s, adj)
-        if dist[t] < INF:
-            p = reconstruct_path(s, t, prev)
-            if p is not None:
-                return s, t
+        s = rnd.randrange(n)
+        step = bfs_from_src_list(s, adj)
+        reached = [v for v in range(n) if step[v] < INF and v != s]
+        if reached:
+            return s, rnd.choice(reached)
     return None, None
 
 
@@ -0,0 +1,177 @@
+import math
+import random
+import struct
+from array import array
+
+from algorithms_v2 import dijkstra_from_src_list, astar
+from graph_list import (
+    generate_airports_coords_and_routes_phase2,
+    build_adj_list,
+    build_coords_idx,
+    build_reverse_adj,
+    heuristic,
+)
+
+INF = float("inf")
+
+# ALT = A* + Landmarks + Triangle inequality
+# for a landmark L and any nodes v, t:
+#   d(v, t) >= d(L, t) - d(L, v)      (forward distances from L)
+#   d(v, t) >= d(v, L) - d(t, L)      (reverse distances to L)
+# the best of these over all landmarks is a lower bound on the remaining route distance
+# it is in the same units as the edge weights, unlike the straight-line heuristic on lon/lat
+
+_MAGIC = b"ALT1"
+
+
+class LandmarkTables:
+    def __init__(self, landmarks, fwd, bwd):
+        self.landmarks = landmarks  # landmark node indices
+        self.fwd = fwd              # fwd[i][v] = d(landmarks[i], v)
+        self.bwd = bwd              # bwd[i][v] = d(v, landmarks[i])
+        self.pairs = list(zip(fwd, bwd))
+
+
+# pick k landmarks far away from each other (farthest-point selection)
+# each new landmark is the node whose closest existing landmark is farthest away
+# returns (landmarks, fwd) so the forward tables are not computed twice
+def _select_farthest(adj, k, seed):
+    n = len(adj)
+    rnd = random.Random(seed)
+
+    # start from the node farthest from a random node
+    dist, _ = dijkstra_from_src_list(rnd.randrange(n), adj)
+    first = max(range(n), key=lambda v: dist[v] if dist[v] < INF else -1)
+
+    landmarks = [first]
+    fwd = []
+    closest = [INF] * n
+    while True:
+        dist, _ = dijkstra_from_src_list(landmarks[-1], adj)
+        fwd.append(array("d", dist))
+        if len(landmarks) == k:
+            break
+        for v in range(n):
+            if dist[v] < closest[v]:
+                closest[v] = dist[v]
+        best, best_v = -1.0, -1
+        for v in range(n):
+            if closest[v] < INF and closest[v] > best and v not in landmarks:
+                best, best_v = closest[v], v
+        if best_v == -1:
+            # nothing reachable left, fall back to a random unused node
+            best_v = rnd.choice([v for v in range(n) if v not in landmarks])
+        landmarks.append(best_v)
+    return landmarks, fwd
+
+
+# planar selection: split the map into k pie slices around the center
+# and take the node farthest from the center in each slice
+def _select_planar(coords_idx, k):
+    n = len(coords_idx)
+    cx = sum(x for x, _ in coords_idx) / n
+    cy = sum(y for _, y in coords_idx) / n
+    best = [(-1.0, -1)] * k
+    for v, (x, y) in enumerate(coords_idx):
+        angle = math.atan2(y - cy, x - cx) + math.pi
+        sector = min(int(angle / (2 * math.pi) * k), k - 1)
+        r = math.hypot(x - cx, y - cy)
+        if r > best[sector][0]:
+            best[sector] = (r, v)
+    return [v for _, v in best if v != -1]
+
+
+# adj = adjacency list (or CSRGraph), radj = reverse adjacency
+# method = "farthest" (graph distances) or "planar" (needs coords_idx)
+def build_landmark_tables(adj, radj, k=8, method="farthest", coords_idx=None, seed=0):
+    if method == "farthest":
+        landmarks, fwd = _select_farthest(adj, k, seed)
+    elif method == "planar":
+        landmarks = _select_planar(coords_idx, k)
+        fwd = [array("d", dijkstra_from_src_list(L, adj)[0]) for L in landmarks]
+    else:
+        raise ValueError(f"unknown landmark selection method: {method}")
+
+    bwd = [array("d", dijkstra_from_src_list(L, radj)[0]) for L in landmarks]
+    return LandmarkTables(landmarks, fwd, bwd)
+
+
+# A* heuristic, same call shape as graph_list.heuristic:
+#   astar(src, dst, adj, tables, heuristic_fn=alt_heuristic)
+# INF entries give INF - INF = nan, and nan > best is False, so they are ignored
+# INF - finite = INF is kept on purpose: v cannot reach target at all
+def alt_heuristic(u, target, tables):
+    best = 0.0
+    for fwd, bwd in tables.pairs:
+        a = fwd[target] - fwd[u]
+        if a > best:
+            best = a
+        b = bwd[u] - bwd[target]
+        if b > best:
+            best = b
+    return best
+
+
+# binary layout: magic, n, k, landmark ids (int32), then fwd/bwd per landmark (float64)
+def save_landmark_tables(tables, path):
+    n = len(tables.fwd[0]) if tables.fwd else 0
+    k = len(tables.landmarks)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sii", _MAGIC, n, k))
+        array("i", tables.landmarks).tofile(f)
+        for fwd, bwd in tables.pairs:
+            fwd.tofile(f)
+            bwd.tofile(f)
+
+
+def load_landmark_tables(path):
+    with open(path, "rb") as f:
+        magic, n, k = struct.unpack("<4sii", f.read(12))
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a landmark table file")
+        landmarks = array("i")
+        landmarks.fromfile(f, k)
+        fwd = []
+        bwd = []
+        for _ in range(k):
+            a = array("d")
+            a.fromfile(f, n)
+            fwd.append(a)
+            b = array("d")
+            b.fromfile(f, n)
+            bwd.append(b)
+    return LandmarkTables(list(landmarks), fwd, bwd)
+
+
+# run the same random queries with both heuristics
+# reports how many nodes each A* run labelled (g < INF)
+def compare_expansions(adj, coords_idx, tables, num_pairs=100, seed=0):
+    n = len(adj)
+    rnd = random.Random(seed)
+    total_euclid = 0
+    total_alt = 0
+    for _ in range(num_pairs):
+        s = rnd.randrange(n)
+        t = rnd.randrange(n)
+        g1, _ = astar(s, t, adj, coords_idx, heuristic_fn=heuristic)
+        g2, _ = astar(s, t, adj, tables, heuristic_fn=alt_heuristic)
+        total_euclid += sum(1 for x in g1 if x < INF)
+        total_alt += sum(1 for x in g2 if x < INF)
+    return total_euclid / num_pairs, total_alt / num_pairs
+
+
+if __name__ == "__main__":
+    n = 1000
+    airports, coords, routes = generate_airports_coords_and_routes_phase2(
+        n=n,
+        edge_prob=4.0 / n,
+        seed=5,
+    )
+    adj, name_to_idx = build_adj_list(airports, routes)
+    radj = build_reverse_adj(adj)
+    coords_idx = build_coords_idx(airports, coords)
+
+    for method in ("farthest", "planar"):
+        tables = build_landmark_tables(adj, radj, k=8, method=method, coords_idx=coords_idx)
+        euclid, alt = compare_expansions(adj, coords_idx, tables)
+        print(f"{method:>8}: nodes labelled per query  euclidean={euclid:.1f}  ALT={alt:.1f}")
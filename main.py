@@ -17,11 +17,13 @@ from algorithms_v1 import (
 from graph_list import (
     build_adj_list,
     build_coords_idx,
+    build_reverse_adj,
 )
 from algorithms_v2 import (
     bfs_from_src_list,
     dfs_from_src_list,
-    dijkstra_from_src_list,
+    dijkstra_point_to_point,
+    bidirectional_dijkstra,
     astar,
     reconstruct_path
 )
@@ -182,15 +184,24 @@ def demo_phase2():
     
     print(f"\n--- Optimized Path Finding: {src_name} to {dst_name} ---")
     
-    # Dijkstra (optimized)
+    # Dijkstra (optimized, stops once the destination is settled)
     print("\n1. Dijkstra (Optimized with Adjacency List):")
-    dist, prev = dijkstra_from_src_list(src, adj)
-    path = reconstruct_path(src, dst, prev)
+    d, path = dijkstra_point_to_point(src, dst, adj)
     
     if path:
         path_names = [airports[i] for i in path]
         print(f"   Path: {' → '.join(path_names)}")
-        print(f"   Distance: {dist[dst]:.0f} miles")
+        print(f"   Distance: {d:.0f} miles")
+    
+    # bidirectional Dijkstra
+    print("\n   Bidirectional Dijkstra (forward from source, backward from destination):")
+    radj = build_reverse_adj(adj)
+    d_bi, path_bi = bidirectional_dijkstra(src, dst, adj, radj)
+    
+    if path_bi:
+        path_names_bi = [airports[i] for i in path_bi]
+        print(f"   Path: {' → '.join(path_names_bi)}")
+        print(f"   Distance: {d_bi:.0f} miles")
     
     # A* 
     print("\n2. A* Search (with geographic heuristic):")
@@ -0,0 +1,101 @@
+import numpy as np
+
+INF = float("inf")
+
+# NumPy version of the Phase 1 matrix path (graph_matrix + algorithms_v1)
+# the matrix is one float array instead of a list of lists, and the inner
+# "for v in range(n)" loops become single vectorized row operations
+
+
+# same input and layout as graph_matrix.build_matrix (INF = no route, 0 on the diagonal)
+def build_matrix_np(airports, routes):
+    name_to_idx = {name: i for i, name in enumerate(airports)}
+    n = len(airports)
+    graph = np.full((n, n), INF)
+    np.fill_diagonal(graph, 0.0)
+    for src, des, dist in routes:
+        graph[name_to_idx[src], name_to_idx[des]] = dist
+    return graph
+
+
+# boolean adjacency (True = route or diagonal) for bfs_from_src_np / dfs_from_src_np
+# O(V^2), so build it once when running many sources on the same matrix
+def adjacency_np(graph):
+    return np.isfinite(graph)
+
+
+# BFS one level at a time
+# next frontier = OR of the adjacency rows of the current frontier, minus visited nodes
+# adj = adjacency_np(graph), computed here if not given
+def bfs_from_src_np(s, graph, adj=None):
+    n = graph.shape[0]
+    if adj is None:
+        adj = adjacency_np(graph)
+    step = np.full(n, INF)
+    visited = np.zeros(n, dtype=bool)
+
+    step[s] = 0
+    visited[s] = True
+    frontier = np.array([s])
+    level = 0
+    while frontier.size:
+        level += 1
+        reach = adj[frontier].any(axis=0)
+        reach &= ~visited
+        frontier = np.flatnonzero(reach)
+        visited[frontier] = True
+        step[frontier] = level
+    return step
+
+
+# DFS with the same visiting order as algorithms_v1.dfs_from_src
+# neighbors of a node are found with one row comparison, the walk itself
+# uses an explicit stack, so long chains don't hit the recursion limit
+# adj = adjacency_np(graph), computed here if not given
+def dfs_from_src_np(s, graph, adj=None):
+    n = graph.shape[0]
+    finite = adjacency_np(graph) if adj is None else adj
+    visited = [False] * n
+    order = []
+
+    visited[s] = True
+    order.append(s)
+    stack = [iter(np.flatnonzero(finite[s]).tolist())]
+    while stack:
+        for v in stack[-1]:
+            if not visited[v]:
+                visited[v] = True
+                order.append(v)
+                stack.append(iter(np.flatnonzero(finite[v]).tolist()))
+                break
+        else:
+            stack.pop()
+    return visited, order
+
+
+# O(V^2) Dijkstra without a heap (the right choice for a dense matrix)
+# each round: argmin over the unsettled nodes, then relax the whole row in one vectorized pass
+# returns (dist, prev) arrays, prev works with algorithms_v1.reconstruct_Dijkstra
+def dijkstra_from_src_np(s, graph):
+    n = graph.shape[0]
+    dist = np.full(n, INF)
+    prev = np.full(n, -1, dtype=np.int64)
+    dist[s] = 0.0
+    # dist of unsettled nodes, INF once a node is settled
+    open_dist = dist.copy()
+    cand = np.empty(n)
+    better = np.empty(n, dtype=bool)
+
+    for _ in range(n):
+        u = int(np.argmin(open_dist))
+        d = open_dist[u]
+        if d == INF:
+            break
+        open_dist[u] = INF
+
+        np.add(graph[u], d, out=cand)
+        np.less(cand, dist, out=better)
+        np.copyto(dist, cand, where=better)
+        np.copyto(open_dist, cand, where=better)
+        np.copyto(prev, u, where=better)
+    return dist, prev
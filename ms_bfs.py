@@ -0,0 +1,98 @@
+import numpy as np
+
+UNREACHABLE = 255
+
+# multi-source BFS (MS-BFS): all-pairs hop counts ("min connections")
+#
+# bfs_all_sources runs one BFS per airport. Here 64 * words sources are
+# searched together: every node keeps a bitset (NumPy uint64 words) with one
+# bit per source, and one pass over the edges moves all of them one level:
+#   next[v]  = OR of frontier[u] over all routes u -> v
+#   new[v]   = next[v] & ~seen[v]     (sources reaching v for the first time)
+# the edge pass is a single np.bitwise_or.reduceat over the routes grouped by
+# destination, so the Python loop only runs once per BFS level, not per node
+#
+# output: n x n uint8 matrix, hops[s][t] = number of flights s -> t,
+# UNREACHABLE (255) if there is no route
+
+
+# routes grouped by destination: in_src[in_start[k]:...] are the sources of routes into has_in[k]
+def _incoming_edges(adj):
+    n = len(adj)
+    src = []
+    dst = []
+    for u in range(n):
+        for v, w in adj[u]:
+            src.append(u)
+            dst.append(v)
+    src = np.array(src, dtype=np.int64)
+    dst = np.array(dst, dtype=np.int64)
+    order = np.argsort(dst, kind="stable")
+    src = src[order]
+    dst = dst[order]
+    has_in, in_start = np.unique(dst, return_index=True)
+    return src, has_in, in_start
+
+
+# adj = adjacency list (or CSRGraph)
+# words = uint64 words per bitset, i.e. 64 * words sources per batch
+def ms_bfs_hops(adj, words=4):
+    n = len(adj)
+    hops = np.full((n, n), UNREACHABLE, dtype=np.uint8)
+    if n == 0:
+        return hops
+    in_src, has_in, in_start = _incoming_edges(adj)
+    batch = 64 * words
+
+    for s0 in range(0, n, batch):
+        s1 = min(s0 + batch, n)
+        b = s1 - s0
+        block = hops[s0:s1]     # rows of this batch (view)
+
+        # bit j of node v's bitset = source s0 + j has reached v
+        frontier = np.zeros((n, words), dtype="<u8")
+        for j in range(b):
+            frontier[s0 + j, j // 64] |= np.uint64(1) << np.uint64(j % 64)
+        seen = frontier.copy()
+        block[np.arange(b), np.arange(s0, s1)] = 0
+
+        level = 0
+        while True:
+            level += 1
+            nxt = np.zeros_like(frontier)
+            if in_src.size:
+                nxt[has_in] = np.bitwise_or.reduceat(frontier[in_src], in_start, axis=0)
+            nxt &= ~seen
+            if not nxt.any():
+                break
+            if level >= UNREACHABLE:
+                raise ValueError("hop count does not fit in uint8")
+            seen |= nxt
+            frontier = nxt
+
+            # (n, 64 * words) bits -> block[j][v] = level where source j reached v now
+            bits = np.unpackbits(nxt.view(np.uint8), axis=1, bitorder="little")[:, :b]
+            block[bits.T.astype(bool)] = level
+
+    return hops
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from algorithms_v2 import bfs_all_sources
+    from graph_list import (
+        generate_airports_coords_and_routes_phase2,
+        build_adj_list,
+    )
+
+    for n, edge_prob in ((500, 0.06), (2000, 0.005)):
+        airports, coords, routes = generate_airports_coords_and_routes_phase2(n=n, edge_prob=edge_prob, seed=3)
+        adj, name_to_idx = build_adj_list(airports, routes)
+
+        t0 = perf_counter()
+        bfs_all_sources(adj)
+        t1 = perf_counter()
+        ms_bfs_hops(adj)
+        t2 = perf_counter()
+        print(f"n={n}: one BFS per source {t1 - t0:.3f} s, MS-BFS {t2 - t1:.3f} s ({(t1 - t0) / (t2 - t1):.1f}x)")
@@ -0,0 +1,177 @@
+import csv
+from array import array
+from itertools import islice
+from time import perf_counter
+
+import numpy as np
+
+from graph_csr import _csr_from_edge_arrays
+from great_circle import haversine_miles_np
+
+NULL = "\\N"
+
+# loader for OpenFlights data files (https://openflights.org/data.html)
+#
+# airports.dat: id, name, city, country, IATA, ICAO, latitude, longitude, ...
+# routes.dat:   airline, airline id, source code, source id, dest code, dest id, codeshare, stops, equipment
+# both are headerless CSV with "\N" for missing values
+#
+# rows are read in chunks of chunk_rows (csv.reader streams the file, memory stays
+# at one chunk), airport codes are interned to indices as they appear, and route
+# weights are great-circle miles computed for a whole chunk at once; the edges go
+# straight into the adjacency list (or CSR arrays), no list of (src, dst, w) tuples
+
+
+def _airport_name(row):
+    for code in (row[4], row[5]):       # IATA, else ICAO
+        if code and code != NULL:
+            return code
+    return f"OF{row[0]}"
+
+
+def load_openflights(airports_path, routes_path, chunk_rows=65536, dedup=True, build="list"):
+    """
+    airports_path / routes_path = OpenFlights airports.dat / routes.dat
+    dedup = keep one edge per (src, dst) (the file has one row per airline)
+    build = "list" for an adjacency list, "csr" for a graph_csr.CSRGraph
+
+    Returns:
+      (airports, coords_idx, adj, name_to_idx, stats)
+      airports[i] = IATA code (ICAO if there is none), coords_idx[i] = (lon, lat)
+      like main.load_real_airport_data, weights in miles
+      name_to_idx also maps ICAO codes
+      stats = row counts, seconds and rows/sec for both files
+    """
+    if build not in ("list", "csr"):
+        raise ValueError(f"unknown build: {build}")
+    stats = {}
+
+    # ---- airports ----
+    t0 = perf_counter()
+    airports = []
+    name_to_idx = {}
+    id_to_idx = {}      # OpenFlights numeric id -> index, routes refer to both ids and codes
+    lon = array("d")
+    lat = array("d")
+    rows = 0
+    with open(airports_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        while True:
+            chunk = list(islice(reader, chunk_rows))
+            if not chunk:
+                break
+            rows += len(chunk)
+            for row in chunk:
+                if len(row) < 8:
+                    continue
+                try:
+                    y = float(row[6])
+                    x = float(row[7])
+                except ValueError:
+                    continue
+                name = _airport_name(row)
+                if name in name_to_idx:
+                    # repeated code: routes by id still go to the first airport with it
+                    id_to_idx[row[0]] = name_to_idx[name]
+                    continue
+                i = len(airports)
+                airports.append(name)
+                name_to_idx[name] = i
+                if row[5] and row[5] != NULL:
+                    name_to_idx.setdefault(row[5], i)
+                id_to_idx[row[0]] = i
+                lon.append(x)
+                lat.append(y)
+    n = len(airports)
+    sec = perf_counter() - t0
+    stats["airport_rows"] = rows
+    stats["airports"] = n
+    stats["airport_seconds"] = sec
+    stats["airport_rows_per_sec"] = rows / sec if sec > 0 else 0.0
+
+    # ---- routes ----
+    t0 = perf_counter()
+    lon_np = np.frombuffer(lon, dtype=np.float64)
+    lat_np = np.frombuffer(lat, dtype=np.float64)
+    adj = [[] for _ in range(n)] if build == "list" else None
+    all_src = array("i")
+    all_dst = array("i")
+    all_w = array("d")
+    seen = set()
+    rows = 0
+    kept = 0
+    skipped = 0
+    duplicates = 0
+
+    def lookup(code, of_id):
+        i = id_to_idx.get(of_id)
+        if i is None:
+            i = name_to_idx.get(code)
+        return i
+
+    with open(routes_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        while True:
+            chunk = list(islice(reader, chunk_rows))
+            if not chunk:
+                break
+            rows += len(chunk)
+            src = array("i")
+            dst = array("i")
+            for row in chunk:
+                if len(row) < 6:
+                    skipped += 1
+                    continue
+                u = lookup(row[2], row[3])
+                v = lookup(row[4], row[5])
+                if u is None or v is None or u == v:
+                    skipped += 1
+                    continue
+                if dedup:
+                    key = u * n + v
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                src.append(u)
+                dst.append(v)
+            if not src:
+                continue
+
+            s = np.frombuffer(src, dtype=np.int32)
+            d = np.frombuffer(dst, dtype=np.int32)
+            w = haversine_miles_np(lon_np[s], lat_np[s], lon_np[d], lat_np[d])
+            kept += len(src)
+            if build == "list":
+                for u, v, wt in zip(src, dst, w.tolist()):
+                    adj[u].append((v, wt))
+            else:
+                all_src.extend(src)
+                all_dst.extend(dst)
+                all_w.frombytes(w.tobytes())
+
+    if build == "csr":
+        adj = _csr_from_edge_arrays(n, all_src, all_dst, all_w)
+    sec = perf_counter() - t0
+    stats["route_rows"] = rows
+    stats["routes"] = kept
+    stats["duplicates"] = duplicates
+    stats["skipped"] = skipped
+    stats["route_seconds"] = sec
+    stats["route_rows_per_sec"] = rows / sec if sec > 0 else 0.0
+
+    coords_idx = list(zip(lon, lat))
+    return airports, coords_idx, adj, name_to_idx, stats
+
+
+if __name__ == "__main__":
+    import sys
+
+    airports_path = sys.argv[1] if len(sys.argv) > 1 else "airports.dat"
+    routes_path = sys.argv[2] if len(sys.argv) > 2 else "routes.dat"
+    airports, coords_idx, adj, name_to_idx, stats = load_openflights(airports_path, routes_path)
+
+    print(f"airports: {stats['airports']} of {stats['airport_rows']} rows "
+          f"in {stats['airport_seconds']:.3f} s ({stats['airport_rows_per_sec']:.0f} rows/s)")
+    print(f"routes: {stats['routes']} kept, {stats['duplicates']} duplicate, {stats['skipped']} skipped "
+          f"of {stats['route_rows']} rows in {stats['route_seconds']:.3f} s ({stats['route_rows_per_sec']:.0f} rows/s)")
@@ -0,0 +1,102 @@
+import os
+from array import array
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from algorithms_v2 import (
+    bfs_from_src_list,
+    dfs_from_src_list,
+    dijkstra_from_src_list,
+)
+from graph_csr import CSRGraph, csr_from_adj_list
+
+# parallel version of bfs_all_sources / dfs_all_sources / dijkstra_all_sources
+#
+# the graph is flattened to CSR and copied once into multiprocessing.shared_memory
+# every worker attaches to the same blocks and wraps them in a CSRGraph (no copy),
+# then runs the normal algorithms_v2 search for its range of sources
+# and writes each result row into a shared n x n output buffer
+# (nothing per source is pickled back to the parent)
+#
+# output row s:
+#   "dijkstra" -> float64 distances from s
+#   "bfs"      -> float64 hop counts from s (inf = unreachable)
+#   "dfs"      -> uint8 visited flags from s
+
+_OUTPUT_DTYPE = {
+    "dijkstra": np.float64,
+    "bfs": np.float64,
+    "dfs": np.uint8,
+}
+
+# per-worker state, filled once by _attach
+_worker = {}
+
+
+# the blocks can be larger than asked for (at least 1 byte, rounded up to whole
+# pages on some platforms), so only the first n + 1 / m / m items are cast
+def _attach(names, n, m, algo):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    offsets = blocks[0].buf[:8 * (n + 1)].cast("q")
+    if m:
+        targets = blocks[1].buf[:4 * m].cast("i")
+        weights = blocks[2].buf[:8 * m].cast("d")
+    else:
+        targets = array("i")
+        weights = array("d")
+    _worker["blocks"] = blocks
+    _worker["graph"] = CSRGraph(offsets, targets, weights)
+    _worker["out"] = np.ndarray((n, n), dtype=_OUTPUT_DTYPE[algo], buffer=blocks[3].buf)
+    _worker["algo"] = algo
+
+
+def _run_range(bounds):
+    start, end = bounds
+    graph = _worker["graph"]
+    out = _worker["out"]
+    algo = _worker["algo"]
+    for s in range(start, end):
+        if algo == "dijkstra":
+            out[s] = dijkstra_from_src_list(s, graph)[0]
+        elif algo == "bfs":
+            out[s] = bfs_from_src_list(s, graph)
+        else:
+            out[s] = dfs_from_src_list(s, graph)[0]
+    return end - start
+
+
+def _shared_copy(buf):
+    shm = shared_memory.SharedMemory(create=True, size=max(len(buf) * buf.itemsize, 1))
+    shm.buf[:len(buf) * buf.itemsize] = buf.tobytes()
+    return shm
+
+
+# adj = adjacency list (or CSRGraph), algo = "dijkstra" | "bfs" | "dfs"
+# workers = number of processes (default: all cores)
+# chunk = sources per task (default: ~4 tasks per worker)
+# returns the n x n result matrix as a NumPy array
+def parallel_all_sources(adj, algo="dijkstra", workers=None, chunk=None):
+    if algo not in _OUTPUT_DTYPE:
+        raise ValueError(f"unknown algorithm: {algo}")
+    csr = adj if isinstance(adj, CSRGraph) else csr_from_adj_list(adj)
+    n = len(csr)
+    m = csr.num_edges()
+    workers = workers or os.cpu_count() or 1
+    chunk = chunk or max(1, n // (workers * 4))
+
+    out_dtype = np.dtype(_OUTPUT_DTYPE[algo])
+    blocks = [_shared_copy(csr.offsets), _shared_copy(csr.targets), _shared_copy(csr.weights)]
+    blocks.append(shared_memory.SharedMemory(create=True, size=max(n * n * out_dtype.itemsize, 1)))
+    try:
+        names = [b.name for b in blocks]
+        ranges = [(s, min(s + chunk, n)) for s in range(0, n, chunk)]
+        with Pool(workers, initializer=_attach, initargs=(names, n, m, algo)) as pool:
+            for _ in pool.imap_unordered(_run_range, ranges):
+                pass
+        result = np.ndarray((n, n), dtype=out_dtype, buffer=blocks[3].buf).copy()
+    finally:
+        for b in blocks:
+            b.close()
+            b.unlink()
+    return result
@@ -0,0 +1,91 @@
+from array import array
+from collections import OrderedDict
+
+from algorithms_v2 import dijkstra_from_src_list, reconstruct_path
+
+INF = float("inf")
+
+# cache of shortest-path trees keyed by (source, graph version)
+#
+# dijkstra_from_src_list already computes dist/prev to *every* airport,
+# so once a source is in the cache any later query from it, to any destination,
+# is answered by reconstruct_path alone (no search)
+# trees are stored as flat arrays (8 + 4 bytes per airport) and evicted
+# least-recently-used first when the total goes over max_bytes
+#
+# graph version: taken from adj.version if the graph has one (dynamic_graph.DynamicGraph),
+# otherwise call bump_version() after changing a plain adjacency list
+
+
+class ShortestPathCache:
+    def __init__(self, adj, max_bytes=64 * 1024 * 1024):
+        self.adj = adj
+        self.max_bytes = max_bytes
+        self.version = 0
+        self.trees = OrderedDict()      # (src, version) -> (dist, prev), LRU order
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._seen_version = self._graph_version()
+
+    def _graph_version(self):
+        return getattr(self.adj, "version", self.version)
+
+    # call after changing a graph that has no version of its own
+    def bump_version(self):
+        self.version += 1
+
+    # trees built for an older graph can never be hit again, drop them all at once
+    def _drop_stale(self, version):
+        if version == self._seen_version:
+            return
+        self._seen_version = version
+        for key in [k for k in self.trees if k[1] != version]:
+            dist, prev = self.trees.pop(key)
+            self.bytes_used -= _tree_bytes(dist, prev)
+            self.invalidations += 1
+
+    def tree(self, src):
+        version = self._graph_version()
+        self._drop_stale(version)
+        key = (src, version)
+        t = self.trees.get(key)
+        if t is not None:
+            self.hits += 1
+            self.trees.move_to_end(key)
+            return t
+
+        self.misses += 1
+        dist, prev = dijkstra_from_src_list(src, self.adj)
+        t = (array("d", dist), array("i", prev))
+        self.trees[key] = t
+        self.bytes_used += _tree_bytes(*t)
+        # always keep the tree just computed, even if it alone is over budget
+        while self.bytes_used > self.max_bytes and len(self.trees) > 1:
+            _, (d, p) = self.trees.popitem(last=False)
+            self.bytes_used -= _tree_bytes(d, p)
+            self.evictions += 1
+        return t
+
+    # returns (distance, path) like reconstruct_path, (INF, None) if unreachable
+    def query(self, src, dst):
+        dist, prev = self.tree(src)
+        if dist[dst] == INF:
+            return INF, None
+        return dist[dst], reconstruct_path(src, dst, prev)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "trees": len(self.trees),
+            "bytes": self.bytes_used,
+        }
+
+
+def _tree_bytes(dist, prev):
+    return len(dist) * dist.itemsize + len(prev) * prev.itemsize
@@ -0,0 +1,219 @@
+import random
+
+import numpy as np
+
+# reachability index: "can you fly from A to B at all?" in O(1)
+#
+# 1) strongly connected components (Tarjan, iterative): airports that can all
+#    reach each other collapse into one component
+# 2) condensation DAG: one node per component, an edge wherever a route
+#    crosses two components
+# 3) transitive closure of the DAG as packed bitsets, one row per component
+#    (C x C bits, C = number of components); bit d of row c = c reaches d
+#
+# reachable(u, v) is then a single bit lookup, no traversal
+# memory is C^2 / 8 bytes: fine for route graphs, which usually have one giant
+# component plus a few thousand stragglers, not for 10^5 singleton components
+
+
+def strongly_connected_components(adj):
+    """
+    Tarjan's algorithm with an explicit stack of neighbor iterators (no recursion).
+
+    Returns:
+      (comp, num_comps), comp[u] = component id of airport u
+      ids are in reverse topological order: every route between components
+      goes from a higher id to a lower one
+    """
+    n = len(adj)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    comp = [-1] * n
+    counter = 0
+    num_comps = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adj[root]))]
+
+        while work:
+            u, it = work[-1]
+            for v, w in it:
+                if index[v] == -1:
+                    # tree edge: descend into v, resume u's iterator afterwards
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                    work.append((v, iter(adj[v])))
+                    break
+                if on_stack[v] and index[v] < low[u]:
+                    low[u] = index[v]
+            else:
+                # all neighbors of u done
+                work.pop()
+                if work:
+                    p = work[-1][0]
+                    if low[u] < low[p]:
+                        low[p] = low[u]
+                if low[u] == index[u]:
+                    # u is the root of a component: pop it off the stack
+                    while True:
+                        x = stack.pop()
+                        on_stack[x] = False
+                        comp[x] = num_comps
+                        if x == u:
+                            break
+                    num_comps += 1
+
+    return comp, num_comps
+
+
+def condensation(adj, comp, num_comps):
+    """
+    DAG of components: dag[c] = sorted list of components with a route out of c.
+    """
+    out = [set() for _ in range(num_comps)]
+    for u in range(len(adj)):
+        cu = comp[u]
+        for v, w in adj[u]:
+            cv = comp[v]
+            if cv != cu:
+                out[cu].add(cv)
+    return [sorted(s) for s in out]
+
+
+class ReachabilityIndex:
+    """
+    Built once per graph (adjacency list, CSRGraph or DynamicGraph snapshot),
+    then answers reachable(u, v) with one bit lookup.
+    """
+
+    def __init__(self, adj):
+        n = len(adj)
+        self.comp, self.num_comps = strongly_connected_components(adj)
+        self.dag = condensation(adj, self.comp, self.num_comps)
+        num_comps = self.num_comps
+
+        # closure rows, bit d of row c (little bit order) = c reaches d
+        # components come in reverse topological order, so every successor of c
+        # has a smaller id and its row is already complete when c is processed
+        row_bytes = (num_comps + 7) // 8
+        bits = np.zeros((num_comps, row_bytes), dtype=np.uint8)
+        for c in range(num_comps):
+            succ = self.dag[c]
+            if succ:
+                bits[c] = np.bitwise_or.reduce(bits[succ], axis=0)
+            bits[c, c >> 3] |= 1 << (c & 7)
+        self.bits = bits
+
+        # airports grouped by component (CSR-style), for the pair sampler
+        comp_arr = np.array(self.comp, dtype=np.int64)
+        self.size = np.bincount(comp_arr, minlength=num_comps)
+        self.members = np.argsort(comp_arr, kind="stable")
+        self.comp_start = np.zeros(num_comps + 1, dtype=np.int64)
+        np.cumsum(self.size, out=self.comp_start[1:])
+
+        # reach_count[u] = number of airports reachable from u, u itself excluded
+        comp_reach = np.zeros(num_comps, dtype=np.int64)
+        for c0 in range(0, num_comps, 1024):
+            rows = np.unpackbits(bits[c0:c0 + 1024], axis=1, bitorder="little")[:, :num_comps]
+            comp_reach[c0:c0 + 1024] = rows.astype(np.int64) @ self.size
+        self.reach_count = comp_reach[comp_arr] - 1 if n else comp_reach[:0]
+        self.pair_start = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self.reach_count, out=self.pair_start[1:])
+
+    def reachable(self, u, v):
+        cu = self.comp[u]
+        cv = self.comp[v]
+        return bool((self.bits[cu, cv >> 3] >> (cv & 7)) & 1)
+
+    def same_component(self, u, v):
+        return self.comp[u] == self.comp[v]
+
+    def num_connected_pairs(self):
+        """
+        Number of ordered pairs (s, t), s != t, with t reachable from s.
+        """
+        return int(self.pair_start[-1])
+
+    def reachable_from(self, u):
+        """
+        Sorted array of all airports reachable from u (u included).
+        """
+        row = np.unpackbits(self.bits[self.comp[u]], bitorder="little")[:self.num_comps]
+        comps = np.flatnonzero(row)
+        if comps.size == 0:
+            return comps
+        return np.sort(np.concatenate([
+            self.members[self.comp_start[c]:self.comp_start[c + 1]] for c in comps
+        ]))
+
+    def sample_connected_pair(self, rnd=random):
+        """
+        Uniformly random ordered pair (s, t), s != t, with a route from s to t.
+        rnd = random module or a seeded random.Random
+
+        Returns:
+          (s, t) or (None, None) if no airport reaches any other
+        """
+        total = self.num_connected_pairs()
+        if total == 0:
+            return None, None
+
+        # pair number r -> source s (pairs are numbered source by source)
+        r = rnd.randrange(total)
+        s = int(np.searchsorted(self.pair_start, r, side="right")) - 1
+        r -= int(self.pair_start[s])
+
+        # r-th airport reachable from s, skipping s itself
+        cs = self.comp[s]
+        row = np.unpackbits(self.bits[cs], bitorder="little")[:self.num_comps]
+        comps = np.flatnonzero(row)
+        sizes = self.size[comps].copy()
+        sizes[comps == cs] -= 1
+        k = int(np.searchsorted(np.cumsum(sizes), r, side="right"))
+        c = int(comps[k])
+        r -= int(sizes[:k].sum())
+        group = self.members[self.comp_start[c]:self.comp_start[c + 1]]
+        if c == cs:
+            group = group[group != s]
+        return s, int(group[r])
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from algorithms_v2 import bfs_from_src_list
+    from graph_list import (
+        generate_airports_coords_and_routes_phase2,
+        build_adj_list,
+    )
+
+    n = 2000
+    airports, coords, routes = generate_airports_coords_and_routes_phase2(n=n, edge_prob=1.2 / n, seed=7)
+    adj, name_to_idx = build_adj_list(airports, routes)
+
+    t0 = perf_counter()
+    index = ReachabilityIndex(adj)
+    t1 = perf_counter()
+    print(f"n={n}: {index.num_comps} components, index built in {t1 - t0:.3f} s")
+    print(f"connected ordered pairs: {index.num_connected_pairs()} of {n * (n - 1)}")
+
+    rnd = random.Random(0)
+    pairs = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(100000)]
+    t0 = perf_counter()
+    for s, t in pairs:
+        index.reachable(s, t)
+    t1 = perf_counter()
+    print(f"100000 reachable() queries: {t1 - t0:.3f} s")
+
+    s, t = index.sample_connected_pair(rnd)
+    print(f"sampled pair: {airports[s]} -> {airports[t]}, hops = {bfs_from_src_list(s, adj)[t]}")
@@ -0,0 +1,433 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+
+# long-running route query service: JSON lines over TCP or a Unix socket
+#
+#   python route_service.py serve --unix /tmp/routes.sock --graph synthetic --n 100000
+#   python route_service.py loadtest --unix /tmp/routes.sock --requests 20000
+#
+# request:  {"id": 1, "op": "shortest", "src": "JFK", "dst": "LAX"}
+#           op = "shortest" | "astar" | "kshortest" (+ "k") | "stops" (+ "max_stops")
+#                "airports" (list of codes) | "stats" (service counters)
+# response: {"id": 1, "ok": true, "distance": 2475.0, "path": ["JFK", "LAX"]}
+#           {"id": 1, "ok": false, "error": "..."} on bad input
+#           responses on one connection may come back out of order, match them by id
+#
+# the graph is loaded once per worker process (ProcessPoolExecutor initializer),
+# the event loop only parses requests and batches them:
+# at most one job per worker is running, and "shortest" / "stops" requests with
+# the same source (and max_stops) that arrive while their job is still queued join
+# it, so one search answers all of them
+# (dijkstra_multi_target / route_min_stops_then_cost_many)
+
+
+# ---------------- worker side ---------------- #
+
+_graph = None
+
+
+# spec = {"kind": "real"} | {"kind": "synthetic", "n", "edge_prob", "seed"} | {"kind": "snapshot", "path", "metric"}
+# (metric = how the snapshot's coords relate to its weights, "haversine" or "euclidean")
+# returns {"adj", "airports", "name_to_idx", "heur"} (heur = A* potentials, None without coords)
+def load_graph(spec):
+    from graph_list import build_adj_list, build_coords_idx
+    from great_circle import GreatCircleHeuristic
+
+    kind = spec["kind"]
+    if kind == "real":
+        from main import load_real_airport_data
+        airports, routes, coords = load_real_airport_data()
+        adj, name_to_idx = build_adj_list(airports, routes)
+        coords_idx = build_coords_idx(airports, coords)
+        metric = "haversine"
+    elif kind == "synthetic":
+        from synthetic_network import SyntheticNetwork
+        net = SyntheticNetwork(spec["n"], spec["edge_prob"], seed=spec["seed"])
+        csr = net.to_csr()
+        adj = [list(csr[u]) for u in range(spec["n"])]
+        airports = net.airports()
+        name_to_idx = {name: i for i, name in enumerate(airports)}
+        coords_idx = [tuple(c) for c in net.coords.tolist()]
+        metric = "euclidean"
+    elif kind == "snapshot":
+        # mapped read-only: every worker shares the same page-cache copy
+        from snapshot import load_snapshot
+        snap = load_snapshot(spec["path"])
+        adj = snap.graph
+        airports = snap.airports()
+        name_to_idx = {name: i for i, name in enumerate(airports)}
+        coords_idx = snap.coords_idx()
+        metric = spec.get("metric", "haversine")
+    else:
+        raise ValueError(f"unknown graph kind: {kind}")
+
+    heur = GreatCircleHeuristic(coords_idx, adj, metric=metric) if coords_idx else None
+    return {"adj": adj, "airports": airports, "name_to_idx": name_to_idx, "heur": heur}
+
+
+def _init_worker(spec):
+    global _graph
+    _graph = load_graph(spec)
+
+
+def _index(name):
+    i = _graph["name_to_idx"].get(name)
+    if i is None:
+        raise KeyError(f"unknown airport {name!r}")
+    return i
+
+
+def _path_result(d, path):
+    if path is None:
+        return {"distance": None, "path": None}
+    names = _graph["airports"]
+    return {"distance": d, "path": [names[v] for v in path]}
+
+
+# one search from src for every dst in dsts -> {dst: result dict}
+def _run_batch(op, src, param, dsts):
+    from algorithms_v2 import dijkstra_multi_target, reconstruct_path
+    from step_constraint import route_min_stops_then_cost_many
+
+    adj = _graph["adj"]
+    s = _index(src)
+    out = {}
+    targets = {}
+    for name in dsts:
+        i = _graph["name_to_idx"].get(name)
+        if i is None:
+            out[name] = {"error": f"unknown airport {name!r}"}
+        else:
+            targets[name] = i
+
+    if op == "shortest":
+        dist, prev = dijkstra_multi_target(s, adj, list(targets.values()))
+        for name, t in targets.items():
+            path = reconstruct_path(s, t, prev) if dist[t] < float("inf") else None
+            out[name] = _path_result(dist[t], path)
+    elif op == "stops":
+        res = route_min_stops_then_cost_many(adj, s, list(targets.values()), param)
+        for name, t in targets.items():
+            steps, cost, path = res[t]
+            r = _path_result(cost, path)
+            # stops = airports between src and dst; steps == 0 is src == dst, no flight
+            r["stops"] = None if steps is None else max(steps - 1, 0)
+            out[name] = r
+    return out
+
+
+# single point-to-point query
+def _run_single(op, src, dst, param):
+    from algorithms_v2 import astar_potential, reconstruct_path
+    from kth_smallest import iter_shortest_paths
+
+    adj = _graph["adj"]
+    s = _index(src)
+    t = _index(dst)
+    if op == "astar":
+        heur = _graph["heur"]
+        if heur is None:
+            raise ValueError("graph has no coordinates for A*")
+        g, prev = astar_potential(s, t, adj, heur.potentials(t))
+        path = reconstruct_path(s, t, prev) if g[t] < float("inf") else None
+        return _path_result(g[t], path)
+    if op == "kshortest":
+        return {"paths": [_path_result(c, p) for c, p in islice(iter_shortest_paths(adj, s, t), param)]}
+    raise ValueError(f"unknown op {op!r}")
+
+
+def _airport_names():
+    return list(_graph["airports"])
+
+
+# ---------------- service side ---------------- #
+
+BATCH_OPS = {"shortest", "stops"}
+SINGLE_OPS = {"astar", "kshortest"}
+
+
+class RouteService:
+    def __init__(self, pool, workers, max_batch=512):
+        self.pool = pool
+        self.max_inflight = workers
+        self.max_batch = max_batch
+        self.inflight = 0
+        self.queue = deque()    # jobs waiting for a free worker
+        self.pending = {}       # (op, src, param) -> queued batch still open for more requests
+        self.requests = 0
+        self.searches = 0
+        self.batched = 0        # requests answered by a search shared with others
+
+    async def query(self, req):
+        op = req.get("op")
+        loop = asyncio.get_running_loop()
+        if op == "airports":
+            return {"airports": await loop.run_in_executor(self.pool, _airport_names)}
+        if op == "stats":
+            return self.stats()
+
+        src = req.get("src")
+        dst = req.get("dst")
+        if not isinstance(src, str) or not isinstance(dst, str):
+            raise ValueError("src and dst must be airport codes")
+        fut = loop.create_future()
+
+        if op in BATCH_OPS:
+            param = int(req.get("max_stops", 1)) if op == "stops" else None
+            key = (op, src, param)
+            batch = self.pending.get(key)
+            if batch is None:
+                batch = self.pending[key] = []
+                self.queue.append((_run_batch, (op, src, param), batch))
+            batch.append((dst, fut))
+            if len(batch) >= self.max_batch:
+                del self.pending[key]       # full, the next request starts a new batch
+        elif op in SINGLE_OPS:
+            param = int(req.get("k", 3)) if op == "kshortest" else None
+            self.queue.append((_run_single, (op, src, dst, param), fut))
+        else:
+            raise ValueError(f"unknown op {op!r}")
+
+        self.requests += 1
+        self._pump()
+        return await fut
+
+    # start queued jobs while a worker is free
+    # jobs wait here rather than in the pool's queue, so a batch keeps collecting
+    # same-source requests until a worker picks it up: the busier the service,
+    # the more requests each search answers
+    def _pump(self):
+        loop = asyncio.get_running_loop()
+        while self.queue and self.inflight < self.max_inflight:
+            fn, args, target = self.queue.popleft()
+            if fn is _run_batch:
+                key = args
+                if self.pending.get(key) is target:
+                    del self.pending[key]
+                dsts = list(dict.fromkeys(dst for dst, _ in target))
+                args = args + (dsts,)
+                if len(target) > 1:
+                    self.batched += len(target)
+            self.inflight += 1
+            self.searches += 1
+            job = loop.run_in_executor(self.pool, fn, *args)
+            job.add_done_callback(lambda job, fn=fn, target=target: self._done(job, fn, target))
+
+    def _done(self, job, fn, target):
+        self.inflight -= 1
+        exc = job.exception()
+        if fn is _run_batch:
+            results = None if exc else job.result()
+            for dst, fut in target:
+                if fut.done():
+                    continue
+                if exc:
+                    fut.set_exception(exc)
+                else:
+                    fut.set_result(results[dst])
+        elif not target.done():
+            if exc:
+                target.set_exception(exc)
+            else:
+                target.set_result(job.result())
+        self._pump()
+
+    def stats(self):
+        return {"requests": self.requests, "searches": self.searches, "batched": self.batched}
+
+    async def _respond(self, line, writer, lock):
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get("id")
+            result = await self.query(req)
+            if "error" in result:
+                resp = {"id": req_id, "ok": False, "error": result["error"]}
+            else:
+                resp = {"id": req_id, "ok": True, **result}
+        except Exception as e:      # bad request or failed search, the connection stays up
+            msg = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+            resp = {"id": req_id, "ok": False, "error": msg or type(e).__name__}
+        async with lock:
+            writer.write(json.dumps(resp).encode() + b"\n")
+            await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    spec = graph_spec(args)
+    workers = args.workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec,))
+    service = RouteService(pool, workers, max_batch=args.max_batch)
+    # make every worker load the graph before the first client connects
+    t0 = perf_counter()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[loop.run_in_executor(pool, _airport_names) for _ in range(workers)])
+    print(f"graph loaded in {perf_counter() - t0:.2f} s ({workers} workers)", file=sys.stderr)
+
+    if args.unix:
+        server = await asyncio.start_unix_server(service.handle_connection, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(service.handle_connection, args.host, args.port)
+        where = f"{args.host}:{args.port}"
+    print(f"serving on {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+# ---------------- load-test client ---------------- #
+
+async def _open(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix, limit=2 ** 24)
+    return await asyncio.open_connection(args.host, args.port, limit=2 ** 24)
+
+
+async def _call(reader, writer, req):
+    writer.write(json.dumps(req).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+# concurrency clients, each with one request in flight, until requests are done
+# sources come from a small set of hot airports so same-source requests overlap
+async def load_test(args):
+    reader, writer = await _open(args)
+    airports = (await _call(reader, writer, {"id": 0, "op": "airports"}))["airports"]
+    before = await _call(reader, writer, {"id": 0, "op": "stats"})
+
+    rnd = random.Random(args.seed)
+    hubs = rnd.sample(airports, min(args.hot_sources, len(airports)))
+    mix = []
+    for part in args.mix.split(","):
+        op, weight = part.split("=")
+        mix.append((op, float(weight)))
+    ops, weights = zip(*mix)
+    requests = []
+    for i in range(args.requests):
+        op = rnd.choices(ops, weights)[0]
+        req = {"id": i + 1, "op": op, "src": rnd.choice(hubs), "dst": rnd.choice(airports)}
+        if op == "kshortest":
+            req["k"] = 3
+        elif op == "stops":
+            req["max_stops"] = 2
+        requests.append(req)
+
+    latencies = []
+    errors = 0
+    it = iter(requests)
+
+    async def client():
+        nonlocal errors
+        r, w = await _open(args)
+        for req in it:
+            t0 = perf_counter()
+            resp = await _call(r, w, req)
+            latencies.append(perf_counter() - t0)
+            if not resp.get("ok"):
+                errors += 1
+        w.close()
+
+    t0 = perf_counter()
+    await asyncio.gather(*[client() for _ in range(args.concurrency)])
+    elapsed = perf_counter() - t0
+
+    after = await _call(reader, writer, {"id": 0, "op": "stats"})
+    writer.close()
+
+    latencies.sort()
+    q = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    searches = after["searches"] - before["searches"]
+    print(f"{len(latencies)} requests, {args.concurrency} clients: {len(latencies) / elapsed:.0f} req/s, "
+          f"{errors} errors")
+    print(f"latency ms: p50 {q(0.50):.2f}  p95 {q(0.95):.2f}  p99 {q(0.99):.2f}  "
+          f"mean {statistics.fmean(latencies) * 1000:.2f}")
+    print(f"server: {searches} searches for {after['requests'] - before['requests']} requests "
+          f"({after['batched'] - before['batched']} answered by a shared search)")
+    return 1 if errors else 0
+
+
+# --graph / --n / --avg-degree / --snapshot / --metric options, shared with batch_queries.py
+def add_graph_arguments(parser):
+    parser.add_argument("--graph", choices=("real", "synthetic", "snapshot"), default="real")
+    parser.add_argument("--n", type=int, default=10000, help="airports for --graph synthetic")
+    parser.add_argument("--avg-degree", type=float, default=4.0, help="routes per airport for --graph synthetic")
+    parser.add_argument("--snapshot", help="snapshot file for --graph snapshot")
+    parser.add_argument("--metric", choices=("haversine", "euclidean"), default="haversine",
+                        help="coordinates of the --graph snapshot file: (lon, lat) or plane (x, y)")
+
+
+# load_graph spec from the add_graph_arguments options (args.seed seeds synthetic graphs)
+def graph_spec(args):
+    if args.graph == "synthetic":
+        return {"kind": "synthetic", "n": args.n, "edge_prob": args.avg_degree / max(args.n - 1, 1), "seed": args.seed}
+    if args.graph == "snapshot":
+        if not args.snapshot:
+            raise SystemExit("--graph snapshot needs --snapshot PATH")
+        return {"kind": "snapshot", "path": args.snapshot, "metric": args.metric}
+    return {"kind": "real"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Airport route query service")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("serve", "loadtest"):
+        p = sub.add_parser(name)
+        p.add_argument("--unix", help="Unix socket path (default: TCP)")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=8765)
+        p.add_argument("--seed", type=int, default=0)
+
+    s = sub.choices["serve"]
+    add_graph_arguments(s)
+    s.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    s.add_argument("--max-batch", type=int, default=512, help="most requests answered by one search")
+
+    t = sub.choices["loadtest"]
+    t.add_argument("--concurrency", type=int, default=64)
+    t.add_argument("--requests", type=int, default=10000)
+    t.add_argument("--hot-sources", type=int, default=32, help="number of distinct sources queried")
+    t.add_argument("--mix", default="shortest=0.7,stops=0.2,astar=0.08,kshortest=0.02")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    return asyncio.run(load_test(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
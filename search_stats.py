@@ -0,0 +1,52 @@
+# per-call work counters for the searches
+#
+# pass stats=SearchStats() to dijkstra_from_src_list, astar, route_min_stops_then_cost
+# or k_shortest_paths / iter_shortest_paths; the call then runs an instrumented copy
+# of the search loop that counts into local variables and adds them here at the end.
+# with the default stats=None the plain loop runs, the only cost is one
+# "stats is None" check per call, nothing per iteration
+#
+# counters add up over calls, so one SearchStats can cover a whole batch of queries
+#   pushes        heap pushes
+#   pops          heap pops
+#   stale_pops    pops skipped because the node was already reached more cheaply
+#   relaxations   edges looked at
+#   settled       nodes taken off the heap for good (non-stale pops)
+#   peak_heap     largest heap size seen in any call
+#   spur_searches spur searches run by Yen's algorithm
+#
+# route_min_stops_then_cost has no heap, its layer sweep maps onto the same names:
+# a label expanded is a pop, an improved candidate a push, a candidate dropped by
+# dominance a stale pop, a label kept is settled and peak_heap is the widest layer
+
+
+class SearchStats:
+    FIELDS = ("pushes", "pops", "stale_pops", "relaxations", "settled", "peak_heap", "spur_searches")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.relaxations = 0
+        self.settled = 0
+        self.peak_heap = 0
+        self.spur_searches = 0
+
+    # called once per search (or per layer) by the instrumented variants
+    def record(self, pushes, pops, stale_pops, relaxations, settled, peak_heap):
+        self.pushes += pushes
+        self.pops += pops
+        self.stale_pops += stale_pops
+        self.relaxations += relaxations
+        self.settled += settled
+        if peak_heap > self.peak_heap:
+            self.peak_heap = peak_heap
+
+    def as_dict(self):
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    def __repr__(self):
+        return "SearchStats(" + ", ".join(f"{f}={getattr(self, f)}" for f in self.FIELDS) + ")"
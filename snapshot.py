@@ -0,0 +1,217 @@
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from time import perf_counter
+
+from graph_csr import CSRGraph, csr_from_adj_list
+
+# binary graph snapshot: the CSR graph, coordinates and airport codes in one file
+# that is memory-mapped on load (no parsing, no copies, pages shared between processes)
+#
+# file layout (little endian, every section starts on an 8-byte boundary):
+#   header (48 bytes): magic, version, flags, n, m, crc32 of everything after the header
+#   section table: (offset, nbytes) for each section below
+#   offsets:       (n + 1) int64    CSR offsets, like graph_csr.CSRGraph
+#   targets:       m int32
+#   weights:       m float64
+#   coords:        n * 2 float64    (x, y) / (lon, lat) per airport, empty if not saved
+#   name_offsets:  (n + 1) int64    name of airport i = names[name_offsets[i]:name_offsets[i + 1]]
+#   names:         utf-8 bytes
+#
+# the loaded graph is a CSRGraph over memoryviews of the mapping, so every search
+# (bfs/dijkstra/A*/...) runs on it directly
+
+_MAGIC = b"ARSSNAP\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQI12x")
+_SECTIONS = ("offsets", "targets", "weights", "coords", "name_offsets", "names")
+_SECTION_TABLE = struct.Struct("<" + "QQ" * len(_SECTIONS))
+_FORMATS = {"offsets": "q", "targets": "i", "weights": "d", "coords": "d", "name_offsets": "q", "names": "B"}
+
+FLAG_COORDS = 1
+
+
+def _align(pos):
+    return (pos + 7) & ~7
+
+
+# graph = adjacency list or CSRGraph
+# airports[i] = code / name of airport i, coords_idx[i] = (x, y) (optional)
+def save_snapshot(path, graph, airports, coords_idx=None):
+    if sys.byteorder != "little":
+        raise ValueError("snapshots are little endian only")
+    if not isinstance(graph, CSRGraph):
+        graph = csr_from_adj_list(graph)
+    n = len(graph)
+    if len(airports) != n:
+        raise ValueError(f"{len(airports)} airport names for {n} nodes")
+
+    coords = array("d")
+    if coords_idx is not None:
+        for x, y in coords_idx:
+            coords.append(x)
+            coords.append(y)
+    names = bytearray()
+    name_offsets = array("q", [0])
+    for name in airports:
+        names += name.encode("utf-8")
+        name_offsets.append(len(names))
+
+    data = {
+        "offsets": array("q", graph.offsets),
+        "targets": array("i", graph.targets),
+        "weights": array("d", graph.weights),
+        "coords": coords,
+        "name_offsets": name_offsets,
+        "names": bytes(names),
+    }
+
+    # section positions
+    table = []
+    pos = _HEADER.size + _SECTION_TABLE.size
+    for key in _SECTIONS:
+        pos = _align(pos)
+        nbytes = len(memoryview(data[key]).cast("B"))
+        table.append((pos, nbytes))
+        pos += nbytes
+
+    body = bytearray(_SECTION_TABLE.pack(*[x for entry in table for x in entry]))
+    for key, (offset, nbytes) in zip(_SECTIONS, table):
+        body += bytes(offset - _HEADER.size - len(body))
+        body += memoryview(data[key]).cast("B")
+
+    flags = FLAG_COORDS if coords_idx is not None else 0
+    header = _HEADER.pack(_MAGIC, _VERSION, flags, n, graph.num_edges(), zlib.crc32(body))
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file.
+
+    graph = CSRGraph over the mapped offsets/targets/weights
+    coords = flat memoryview, coords[2 * i], coords[2 * i + 1] = (x, y) of airport i
+    verify = check the crc32 (reads the whole file once)
+    """
+
+    def __init__(self, path, verify=False):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        self._buf = buf
+        if len(buf) < _HEADER.size + _SECTION_TABLE.size:
+            self.close()
+            raise ValueError(f"{path} is too short for a graph snapshot")
+        magic, version, flags, n, m, crc = _HEADER.unpack_from(buf)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a graph snapshot file")
+        if version != _VERSION:
+            self.close()
+            raise ValueError(f"unsupported snapshot version {version}")
+        if verify and zlib.crc32(buf[_HEADER.size:]) != crc:
+            self.close()
+            raise ValueError(f"{path}: checksum mismatch")
+
+        self.n = n
+        self.m = m
+        self.flags = flags
+        table = _SECTION_TABLE.unpack_from(buf, _HEADER.size)
+        views = {}
+        for i, key in enumerate(_SECTIONS):
+            offset, nbytes = table[2 * i], table[2 * i + 1]
+            if offset + nbytes > len(buf):
+                self.close()
+                raise ValueError(f"{path}: section {key} is truncated")
+            views[key] = buf[offset:offset + nbytes].cast(_FORMATS[key])
+        self._views = views
+
+        self.graph = CSRGraph(views["offsets"], views["targets"], views["weights"])
+        self.coords = views["coords"] if flags & FLAG_COORDS else None
+        self._name_offsets = views["name_offsets"]
+        self._names = views["names"]
+
+    def __len__(self):
+        return self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def airport(self, i):
+        return bytes(self._names[self._name_offsets[i]:self._name_offsets[i + 1]]).decode("utf-8")
+
+    # decoded lists / dicts for code that expects the build_adj_list outputs (O(n))
+    def airports(self):
+        names = bytes(self._names).decode("utf-8")
+        if not names.isascii():
+            # byte offsets != character offsets, decode one by one
+            return [self.airport(i) for i in range(self.n)]
+        off = self._name_offsets
+        return [names[off[i]:off[i + 1]] for i in range(self.n)]
+
+    def name_to_idx(self):
+        return {name: i for i, name in enumerate(self.airports())}
+
+    def coords_idx(self):
+        if self.coords is None:
+            return None
+        c = self.coords
+        return [(c[2 * i], c[2 * i + 1]) for i in range(self.n)]
+
+    # the graph must not be used after close()
+    # safe to call any time: if slices of the mapping are still alive (e.g. an
+    # unfinished graph[u] row iterator) the mapping stays until the last one is gone
+    def close(self):
+        views = getattr(self, "_views", {})
+        for v in views.values():
+            v.release()
+        self._views = {}
+        if getattr(self, "_buf", None) is not None:
+            self._buf.release()
+            self._buf = None
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass        # unmapped when the remaining exports are garbage collected
+            self._mm = None
+
+
+def load_snapshot(path, verify=False):
+    return Snapshot(path, verify)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from synthetic_network import SyntheticNetwork
+    from algorithms_v2 import dijkstra_from_src_list
+
+    n = 100000
+    net = SyntheticNetwork(n, edge_prob=10.0 / n, seed=2)
+    csr = net.to_csr()
+    path = os.path.join(tempfile.gettempdir(), "airport_graph.snap")
+
+    t0 = perf_counter()
+    save_snapshot(path, csr, net.airports(), net.coords.tolist())
+    t1 = perf_counter()
+    snap = load_snapshot(path)
+    t2 = perf_counter()
+    load_snapshot(path, verify=True).close()
+    t3 = perf_counter()
+    print(f"n={n}, m={snap.m}: save {t1 - t0:.2f} s, load {(t2 - t1) * 1000:.3f} ms, "
+          f"load + crc {(t3 - t2) * 1000:.1f} ms, file {os.path.getsize(path) / 1e6:.1f} MB")
+
+    t0 = perf_counter()
+    dist, prev = dijkstra_from_src_list(0, snap.graph)
+    t1 = perf_counter()
+    print(f"dijkstra on the mapped graph: {t1 - t0:.2f} s, airport 0 = {snap.airport(0)}")
+    snap.close()
@@ -1,47 +1,237 @@
-import heapq
+from array import array
+
 INF = float("inf")
 
-def route_min_stops_then_cost(adj, src, dst, max_stops):
+
+def _frontier_layers(adj, src, max_edges):
+    """
+    Layer-by-layer sweep from src, layer k = walks with exactly k edges.
+    Only touched nodes are stored (one small dict per layer, no n-sized rows).
+
+    Dominance pruning: a label (k, v, cost) is dropped if v was already reached
+    with fewer edges at a cost <= cost. Any walk through a dropped label can be
+    shortened to fewer edges at no extra cost, so it never decides the answer.
+
+    Within a layer, nodes are expanded in (cost, node) order and a neighbor keeps
+    the first strictly cheaper parent, which is the same tie-breaking as the
+    heap of (steps, cost, node) entries used before.
+
+    Yields (k, cost, parent) with cost[v] / parent[v] for the labels kept in layer k.
+    """
+    best = {src: 0.0}       # cheapest cost seen at fewer edges, per node
+    cost = {src: 0.0}
+    parent = {src: -1}
+    yield 0, cost, parent
+
+    for k in range(1, max_edges + 1):
+        cand_cost = {}
+        cand_parent = {}
+        for u in sorted(cost, key=lambda x: (cost[x], x)):
+            cost_u = cost[u]
+            for v, w in adj[u]:
+                nd = cost_u + w
+                if nd < cand_cost.get(v, INF):
+                    cand_cost[v] = nd
+                    cand_parent[v] = u
+
+        cost = {}
+        parent = {}
+        for v, c in cand_cost.items():
+            if c < best.get(v, INF):
+                cost[v] = c
+                parent[v] = cand_parent[v]
+                best[v] = c
+        if not cost:
+            return
+        yield k, cost, parent
+
+
+def _frontier_layers_counted(adj, src, max_edges, stats):
+    """
+    _frontier_layers with SearchStats counters (same layers), recorded once per layer
+    so a sweep that the caller stops early is still counted.
+    """
+    best = {src: 0.0}
+    cost = {src: 0.0}
+    parent = {src: -1}
+    stats.record(0, 0, 0, 0, 1, 1)
+    yield 0, cost, parent
+
+    for k in range(1, max_edges + 1):
+        cand_cost = {}
+        cand_parent = {}
+        pushes = relax = 0
+        for u in sorted(cost, key=lambda x: (cost[x], x)):
+            cost_u = cost[u]
+            for v, w in adj[u]:
+                relax += 1
+                nd = cost_u + w
+                if nd < cand_cost.get(v, INF):
+                    cand_cost[v] = nd
+                    cand_parent[v] = u
+                    pushes += 1
+        expanded = len(cost)
+
+        cost = {}
+        parent = {}
+        for v, c in cand_cost.items():
+            if c < best.get(v, INF):
+                cost[v] = c
+                parent[v] = cand_parent[v]
+                best[v] = c
+        stats.record(pushes, expanded, len(cand_cost) - len(cost), relax, len(cost), len(cost))
+        if not cost:
+            return
+        yield k, cost, parent
+
+
+def route_min_stops_then_cost(adj, src, dst, max_stops, stats=None):
     """
     Lexicographic optimization:
       1) minimize number of stops (equivalently edges)
       2) among same edges, minimize total cost
     Constraint:
       edges <= max_edges = max_stops + 1
+    stats = optional search_stats.SearchStats, counts the work of this call
 
     Returns:
       (best_steps, best_cost, path) or (None, INF, None) if impossible
     """
-    n = len(adj)
     max_edges = max_stops + 1
+    if stats is None:
+        layers = _frontier_layers(adj, src, max_edges)
+    else:
+        layers = _frontier_layers_counted(adj, src, max_edges, stats)
+    parent_layers = []
+    for steps, cost, parent in layers:
+        parent_layers.append(parent)
+        if dst in cost:
+            path = reconstruct_constrained_path(parent_layers, src, dst, steps)
+            return steps, cost[dst], path
+    return None, INF, None
+
+
+def route_min_stops_then_cost_many(adj, src, dsts, max_stops):
+    """
+    Batched route_min_stops_then_cost: one sweep from src serves every destination.
+
+    Returns:
+      {dst: (best_steps, best_cost, path)}, (None, INF, None) for unreachable ones
+    """
+    max_edges = max_stops + 1
+    remaining = set(dsts)
+    results = {}
+    parent_layers = []
+    for steps, cost, parent in _frontier_layers(adj, src, max_edges):
+        parent_layers.append(parent)
+        for dst in [d for d in remaining if d in cost]:
+            path = reconstruct_constrained_path(parent_layers, src, dst, steps)
+            results[dst] = (steps, cost[dst], path)
+            remaining.discard(dst)
+        if not remaining:
+            break
+    for dst in remaining:
+        results[dst] = (None, INF, None)
+    return results
 
-    dist = [[INF] * n for _ in range(max_edges + 1)]
-    parent = [[-1] * n for _ in range(max_edges + 1)]
 
-    dist[0][src] = 0.0
-    pq = [(0, 0.0, src)]  # (steps, cost, node)
+class ParetoFrontier:
+    """
+    All non-dominated (stops, distance) labels from one source, stored flat:
+      label_node[i], label_steps[i] (edges), label_cost[i], label_parent[i] (label id or -1)
+    Labels of one airport are reachable through offsets/order (CSR by node),
+    sorted by increasing stops, and therefore by strictly decreasing cost.
+    """
 
-    while pq:
-        steps, cost_u, u = heapq.heappop(pq)
-        if cost_u != dist[steps][u]:
-            continue
+    def __init__(self, n, src, label_node, label_steps, label_cost, label_parent):
+        self.src = src
+        self.label_node = label_node
+        self.label_steps = label_steps
+        self.label_cost = label_cost
+        self.label_parent = label_parent
 
-        if u == dst:
-            path = reconstruct_constrained_path(parent, src, dst, steps)
-            return steps, cost_u, path
+        # group label ids by node (counting sort, stable so steps stay increasing)
+        offsets = array("q", bytes(8 * (n + 1)))
+        for v in label_node:
+            offsets[v + 1] += 1
+        for v in range(n):
+            offsets[v + 1] += offsets[v]
+        order = array("i", bytes(4 * len(label_node)))
+        pos = array("q", offsets[:n])
+        for i, v in enumerate(label_node):
+            order[pos[v]] = i
+            pos[v] += 1
+        self.offsets = offsets
+        self.order = order
 
-        if steps == max_edges:
-            continue
+    def labels(self, v):
+        """
+        Tradeoff curve for airport v: [(stops, cost, label_id), ...]
+        stops = edges - 1 (0 = direct flight), one entry per stop count that is
+        strictly cheaper than every option with fewer stops. Empty for the source itself.
+        """
+        out = []
+        for j in range(self.offsets[v], self.offsets[v + 1]):
+            i = self.order[j]
+            if self.label_steps[i] > 0:
+                out.append((self.label_steps[i] - 1, self.label_cost[i], i))
+        return out
 
-        ns = steps + 1
-        for v, w in adj[u]:
-            nd = cost_u + w
-            if nd < dist[ns][v]:
-                dist[ns][v] = nd
-                parent[ns][v] = u
-                heapq.heappush(pq, (ns, nd, v))
+    def cheapest_within(self, v, max_stops):
+        """
+        Cheapest (stops, cost, label_id) to v using at most max_stops stops, or None.
+        """
+        best = None
+        for label in self.labels(v):
+            if label[0] <= max_stops:
+                best = label
+        return best
 
-    return None, INF, None
+    def path(self, label_id):
+        """
+        Airport-index path of one label.
+        """
+        path = []
+        i = label_id
+        while i != -1:
+            path.append(self.label_node[i])
+            i = self.label_parent[i]
+        path.reverse()
+        return path
+
+
+def pareto_frontier(adj, src, max_stops=None):
+    """
+    Multi-criteria label setting: in one sweep from src, the Pareto set of
+    (stops, distance) for every airport, i.e. the cheapest route at 0, 1, 2, ... stops
+    wherever adding a stop actually saves distance.
+
+    Uses the same dominance-pruned layers as route_min_stops_then_cost, so the
+    kept labels are exactly the non-dominated ones; max_stops = None sweeps until
+    no label improves any more.
+
+    Returns:
+      ParetoFrontier
+    """
+    n = len(adj)
+    max_edges = n if max_stops is None else max_stops + 1
+
+    label_node = array("i")
+    label_steps = array("i")
+    label_cost = array("d")
+    label_parent = array("i")
+    prev_ids = {}
+    for steps, cost, parent in _frontier_layers(adj, src, max_edges):
+        ids = {}
+        for v, c in cost.items():
+            ids[v] = len(label_node)
+            label_node.append(v)
+            label_steps.append(steps)
+            label_cost.append(c)
+            label_parent.append(prev_ids[parent[v]] if steps else -1)
+        prev_ids = ids
+
+    return ParetoFrontier(n, src, label_node, label_steps, label_cost, label_parent)
 
 
 def reconstruct_constrained_path(parent, src, dst, steps):
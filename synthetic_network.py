@@ -0,0 +1,187 @@
+from array import array
+
+import numpy as np
+
+from graph_csr import CSRGraph
+
+# synthetic route networks in O(n + m) instead of O(n^2)
+#
+# generate_airports_coords_and_routes_phase2 flips a coin for each of the
+# n * (n - 1) ordered airport pairs. Here the pairs are numbered
+# 0 .. n * (n - 1) - 1 (source-major) and we jump straight from one route to the
+# next: the gap between two successes of independent coin flips with
+# probability p is geometric(p), so one NumPy draw replaces ~1/p coin flips
+#
+# same model as phase 2: uniform (x, y) coordinates, every ordered pair is a route
+# with probability edge_prob, distance = straight line * uniform(min_factor, max_factor)
+# (the random streams differ, so the same seed gives a different, equally random graph)
+#
+# edges come out in chunks of NumPy arrays, sorted by (source, destination), so
+# they can go straight into a CSR builder or a file without holding a route list
+
+
+# chunks of (src, dst) int64 arrays, every ordered pair i != j kept with probability edge_prob
+# rng = numpy Generator; the pairs only depend on rng, not on chunk_edges
+def iter_pair_chunks(n, edge_prob, rng, chunk_edges=1 << 20):
+    total = n * (n - 1)
+    if total == 0 or edge_prob <= 0:
+        return
+    last = -1
+    while True:
+        gaps = rng.geometric(min(edge_prob, 1.0), size=chunk_edges)
+        pos = last + np.cumsum(gaps)
+        done = pos[-1] >= total
+        if done:
+            pos = pos[:np.searchsorted(pos, total)]
+        if pos.size:
+            last = pos[-1]
+            # pair number -> (i, j), the diagonal j == i is skipped in the numbering
+            src = pos // (n - 1)
+            dst = pos % (n - 1)
+            dst += dst >= src
+            yield src, dst
+        if done:
+            return
+
+
+class SyntheticNetwork:
+    """
+    Phase 2 style random network that is generated chunk by chunk.
+
+    coords = (n, 2) float64 array, built once in the constructor (O(n))
+    chunks() / to_csr() / write_routes_csv() regenerate the routes from the seed
+    each time, so they all see the same graph and memory stays at one chunk.
+    """
+
+    def __init__(
+        self,
+        n,
+        edge_prob=0.1,
+        coord_range=1000.0,
+        directed=True,
+        seed=42,
+        min_factor=1.1,
+        max_factor=2.0,
+    ):
+        self.n = n
+        self.edge_prob = edge_prob
+        self.directed = directed
+        self.min_factor = min_factor
+        self.max_factor = max_factor
+        # independent streams for coordinates, pair gaps and distance factors
+        coord_seed, self._pair_seed, self._factor_seed = np.random.SeedSequence(seed).spawn(3)
+        self.coords = np.random.default_rng(coord_seed).uniform(0, coord_range, size=(n, 2))
+
+    def airports(self):
+        return [f"A{i}" for i in range(self.n)]
+
+    def coords_dict(self):
+        return {f"A{i}": (x, y) for i, (x, y) in enumerate(self.coords.tolist())}
+
+    def chunks(self, chunk_edges=1 << 20):
+        """
+        Yields (src int32, dst int32, w float64) arrays.
+        Directed: sorted by (src, dst) across all chunks.
+        Undirected: each chunk also holds the reverse routes, so it is not sorted.
+        """
+        pair_rng = np.random.default_rng(self._pair_seed)
+        factor_rng = np.random.default_rng(self._factor_seed)
+        xy = self.coords
+        for src, dst in iter_pair_chunks(self.n, self.edge_prob, pair_rng, chunk_edges):
+            d = xy[src] - xy[dst]
+            w = np.hypot(d[:, 0], d[:, 1])
+            w *= factor_rng.uniform(self.min_factor, self.max_factor, size=w.size)
+            src = src.astype(np.int32)
+            dst = dst.astype(np.int32)
+            if not self.directed:
+                src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+                w = np.concatenate([w, w])
+            yield src, dst, w
+
+    def to_csr(self, chunk_edges=1 << 20):
+        """
+        Streams the chunks into a CSRGraph (array.array buffers, like graph_csr.build_csr).
+        Directed edges arrive sorted by source, so targets/weights are appended as they
+        come and only the per-node counts are accumulated; undirected ones are sorted once.
+        """
+        n = self.n
+        counts = np.zeros(n, dtype=np.int64)
+        targets = array("i")
+        weights = array("d")
+        if self.directed:
+            for src, dst, w in self.chunks(chunk_edges):
+                counts += np.bincount(src, minlength=n)
+                targets.frombytes(dst.tobytes())
+                weights.frombytes(w.tobytes())
+        else:
+            parts = list(self.chunks(chunk_edges))
+            src = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, np.int32)
+            order = np.argsort(src, kind="stable")
+            counts = np.bincount(src, minlength=n).astype(np.int64)
+            for k in (1, 2):
+                col = np.concatenate([p[k] for p in parts])[order] if parts else np.zeros(0)
+                (targets if k == 1 else weights).frombytes(col.tobytes())
+
+        offsets = array("q", bytes(8))
+        offsets.frombytes(np.cumsum(counts).tobytes())
+        return CSRGraph(offsets, targets, weights)
+
+    def routes(self, chunk_edges=1 << 20):
+        """
+        Materialized (src_name, dst_name, w) list, same format as phase 2 (small n only).
+        """
+        routes = []
+        for src, dst, w in self.chunks(chunk_edges):
+            routes.extend(zip(
+                [f"A{i}" for i in src.tolist()],
+                [f"A{j}" for j in dst.tolist()],
+                w.tolist(),
+            ))
+        return routes
+
+    def write_routes_csv(self, path, chunk_edges=1 << 20):
+        """
+        Streams "src,dst,distance" rows to path, one chunk at a time.
+        Returns the number of routes written.
+        """
+        m = 0
+        with open(path, "w") as f:
+            f.write("src,dst,distance\n")
+            for src, dst, w in self.chunks(chunk_edges):
+                np.savetxt(f, np.column_stack([src, dst, w]), fmt=["A%d", "A%d", "%.6f"], delimiter=",")
+                m += src.size
+        return m
+
+
+# drop-in for graph_list.generate_airports_coords_and_routes_phase2 (same arguments, same return shape)
+def generate_airports_coords_and_routes_fast(
+    n,
+    edge_prob=0.1,
+    coord_range=1000.0,
+    directed=True,
+    seed=42,
+    min_factor=1.1,
+    max_factor=2.0,
+):
+    net = SyntheticNetwork(n, edge_prob, coord_range, directed, seed, min_factor, max_factor)
+    return net.airports(), net.coords_dict(), net.routes()
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from graph_list import generate_airports_coords_and_routes_phase2
+
+    n = 3000
+    t0 = perf_counter()
+    generate_airports_coords_and_routes_phase2(n=n, edge_prob=4.0 / n)
+    t1 = perf_counter()
+    generate_airports_coords_and_routes_fast(n=n, edge_prob=4.0 / n)
+    t2 = perf_counter()
+    print(f"n={n}: pairwise loop {t1 - t0:.2f} s, skip sampling {t2 - t1:.3f} s")
+
+    for n in (10 ** 5, 10 ** 6):
+        t0 = perf_counter()
+        csr = SyntheticNetwork(n, edge_prob=8.0 / n, seed=1).to_csr()
+        t1 = perf_counter()
+        print(f"n={n}: {csr.num_edges()} routes, CSR {csr.memory_bytes() / 2 ** 20:.1f} MiB in {t1 - t0:.2f} s")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms_v2 import dijkstra_from_src_list, dijkstra_multi_target, many_to_many  # noqa: E402
+
+INF = float("inf")
+
+ADJ = [[(1, 2.0), (2, 5.0)], [(2, 1.0)], [(0, 1.5), (3, 4.0)], []]
+
+
+def test_multi_target_without_targets_does_not_search():
+    dist, prev = dijkstra_multi_target(0, ADJ, [])
+    assert dist == [0, INF, INF, INF]
+    assert prev == [-1, -1, -1, -1]
+    assert many_to_many([0, 1], [], ADJ).shape == (2, 0)
+
+
+def test_multi_target_exact_on_targets():
+    full, _ = dijkstra_from_src_list(0, ADJ)
+    dist, _ = dijkstra_multi_target(0, ADJ, [2, 3])
+    assert dist[2] == full[2] and dist[3] == full[3]
@@ -0,0 +1,17 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot import load_snapshot, save_snapshot  # noqa: E402
+
+
+def test_close_with_live_row_iterator(tmp_path):
+    path = str(tmp_path / "g.snap")
+    save_snapshot(path, [[(1, 2.0)], [(0, 1.0)]], ["A", "B"])
+    snap = load_snapshot(path)
+    row = snap.graph[0]
+    snap.close()
+    snap.close()
+    assert snap._mm is None and snap._views == {}
+    del row